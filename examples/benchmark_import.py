@@ -0,0 +1,71 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Compare the line by line regex import with the single pass parser on synthetic SNLO files.
+
+Usage: python benchmark_import.py [number of values ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from snlohelper.import_snlo_file import _import_snlo_lines, import_snlo_file
+
+COLUMNS = 4
+
+
+def write_synthetic_file(file_name: str, values: int) -> None:
+    """Write a file in SNLO format, negative numbers are fused to their predecessor."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(values // COLUMNS, COLUMNS))
+    data *= 10.0 ** rng.integers(-40, 5, size=data.shape)
+    with open(file_name, "w") as f:
+        for row in data:
+            f.write("".join(f"{v:14.6E}" if v >= 0 else f"{v:.6E}" for v in row) + "\n")
+
+
+def benchmark(values: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "SYNTHETIC.dat")
+        write_synthetic_file(file_name, values)
+        start = time.perf_counter()
+        with open(file_name, "r") as f:
+            old = _import_snlo_lines(f.readlines())
+        old_time = time.perf_counter() - start
+        start = time.perf_counter()
+        new = import_snlo_file("SYNTHETIC.dat", directory + "/")
+        new_time = time.perf_counter() - start
+    assert np.array_equal(old, new)
+    print(
+        f"{values:>10} values: regex {old_time:8.3f} s, single pass {new_time:8.3f} s, "
+        f"speedup {old_time / new_time:6.1f}"
+    )
+
+
+if __name__ == "__main__":
+    for values in [int(float(v)) for v in sys.argv[1:]] or [10**5, 10**6, 10**7]:
+        benchmark(values)
@@ -26,58 +26,16 @@ Example on how to use the SNLO data files.
 
 
 import numpy as np
-import time
-from typing import cast
 
 import matplotlib.pyplot as plt
 import matplotlib.ticker as tic
-import pyautogui as gui
 from scipy import constants as cs
-from scipy.optimize import curve_fit
 
-from snlohelper.utils import scale
-from snlohelper.import_snlo_file import import_snlo_file
-
-
-def gauss(x, x0, a, sigma):
-    """Gaussian function"""
-    return a * np.exp(-((x - x0) ** 2) / (2 * sigma**2))
-
-
-def plotdata(data, xScale=1, yScale=1):
-    """Returns the x and y components of a two dimensional list as individual lists, e.g., for
-    plotting. Optional linear scale factors as additional commands"""
-    xValues = []
-    yValues = []
-    for i in range(len(data)):
-        xValues.append(xScale * data[i][0])
-        yValues.append(yScale * data[i][1])
-    return xValues, yValues
-
-
-def gaussian_fit(data, print_output=False):
-    """performs Gaussian fit (position, amplitude, standard deviation), returns popt, sdev, serr,
-    pcov"""
-    # arguments of gauss-function: gauss(x, x0, a, sigma)
-    x, y = plotdata(data)
-
-    # find peak position
-    peak_pos = x[list(y).index(max(y))]
-
-    try:
-        popt, pcov = curve_fit(gauss, x, y, p0=[peak_pos, 1, 1])
-    except RuntimeError:
-        print("fit failed!")
-        popt, pcov = [0, 0, 0], np.zeros((3, 3)).tolist()
-
-    # covariance matrix: diagonal elements are the variances, hence, the square root is the
-    # standard deviation
-    sdev = np.sqrt(abs(pcov.diagonal()).tolist())
-
-    # standard errors are sd/sqrt(n) with the sample size n
-    serr = sdev / (np.sqrt(len(data)))
-
-    return popt, sdev, serr, pcov
+from snlohelper.utils import click
+from snlohelper.file_watch import FileWatcher
+from snlohelper.gaussian import estimate_gaussians, gauss
+from snlohelper.functions import Functions
+from snlohelper.output_files import load_output_set, output_sets
 
 
 def plot_options(
@@ -152,41 +110,23 @@ def get_spectr(
     call_function: for 2D-mix-LP you have to click on 'Spectra' to calculate the spectra.
     display_results: gives plots for spectra and powers
     returns dictionary with bandwidths and durations (given as FWHMs)"""
+    watcher = FileWatcher(output_sets[Functions.TWOD_MIX_LP])
     if call_function:
-        gui.click(*scale(400, 260))
-        time.sleep(0.5)
-
-    # detuning [MHz], Red1, Red2, Blue
-    spectr = import_snlo_file("OPA2D_SP.dat")
-    # time, power, phase, Mx^2, My^2, Rad Curv c, Rad Curv y, X-tilt, w_x^2, w_y^2
-    id_beam = import_snlo_file("ID_BEAM.dat")
-    sig_beam = import_snlo_file("SIG_BEAM.dat")
-    pmp_beam = import_snlo_file("PMP_BEAM.dat")
-
-    # fit idler duration
-    x = 1e9 * id_beam.T[0]  # ns
-    y = id_beam.T[1]
-    idl = gaussian_fit(np.array([x, y]).T, False)[0]
-    fwhm_ns_idl = abs(2 * np.sqrt(2 * np.log(2)) * idl[2])
-    x_lists = [x.copy()]
-    y_lists = [y.copy()]
-
-    # fit signal duration
-    x = 1e9 * sig_beam.T[0]  # ns
-    y = sig_beam.T[1]
-    sig = gaussian_fit(np.array([x, y]).T, False)[0]
-    fwhm_ns_sig = abs(2 * np.sqrt(2 * np.log(2)) * sig[2])
-    x_lists.append(x)
-    y_lists.append(y)
-
-    # fit pump duration
-    x = 1e9 * pmp_beam.T[0]  # ns
-    y = pmp_beam.T[1]
-    pmp = gaussian_fit(np.array([x, y]).T, False)[0]
-    fwhm_ns_pmp = abs(2 * np.sqrt(2 * np.log(2)) * pmp[2])
-    x_lists.append(x)
-    y_lists.append(y)
-    fits = idl, sig, pmp
+        click((400, 260))
+        watcher.wait()
+    # named columns, see `output_files.schemas`
+    output = load_output_set(Functions.TWOD_MIX_LP)
+    spectr = output["OPA2D_SP.dat"]
+    id_beam = output["ID_BEAM.dat"]
+    sig_beam = output["SIG_BEAM.dat"]
+    pmp_beam = output["PMP_BEAM.dat"]
+
+    # fit the pulse durations of idler, signal, and pump in one pass
+    beams = id_beam, sig_beam, pmp_beam
+    x_lists = [1e9 * beam["time"] for beam in beams]  # ns
+    y_lists = [beam["power"] for beam in beams]
+    fits = estimate_gaussians(np.stack(x_lists), np.stack(y_lists))
+    fwhm_ns_idl, fwhm_ns_sig, fwhm_ns_pmp = fits.fwhm
     if display_results:
         # plot pulse durations
         fig, ax = plt.subplots(1, 3)
@@ -217,22 +157,11 @@ def get_spectr(
         plt.show()
 
     # fit spectra
-    x = spectr.T[0]  # in MHz
-    y_idl = spectr.T[1]
-    y_sig = spectr.T[2]
-    y_pmp = spectr.T[3]
-
-    idl = cast(list[float], gaussian_fit(np.array([x, y_idl]).T, False)[0])
-    sig = cast(list[float], gaussian_fit(np.array([x, y_sig]).T, False)[0])
-    pmp = cast(list[float], gaussian_fit(np.array([x, y_pmp]).T, False)[0])
-
-    fwhm_spec_idl = abs(2 * np.sqrt(2 * np.log(2)) * idl[2])
-    fwhm_spec_sig = abs(2 * np.sqrt(2 * np.log(2)) * sig[2])
-    fwhm_spec_pmp = abs(2 * np.sqrt(2 * np.log(2)) * pmp[2])
-
-    y_lists = y_idl, y_sig, y_pmp
+    x = spectr["detuning"]  # in MHz
+    y_lists = [spectr["red1"], spectr["red2"], spectr["blue"]]
+    fits = estimate_gaussians(x, np.stack(y_lists))
+    fwhm_spec_idl, fwhm_spec_sig, fwhm_spec_pmp = fits.fwhm
 
-    fits = idl, sig, pmp
     if display_results:
         # plot spectra durations
         fig, ax = plt.subplots(1, 3)
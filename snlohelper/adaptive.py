@@ -0,0 +1,231 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Adaptive sampling
+=================
+
+Sample an output of a function where it changes instead of on a uniform grid::
+
+    mix = MainWindow().open_two_d_mix_lp()
+    x, y, results = sample_1d(
+        mix,
+        ("Energy/power (J or W)", 1),
+        1e-4,
+        15e-3,
+        output=("Output pulse energy (mJ)", 2),
+        tolerance=1e-3,
+        budget=20,
+    )
+"""
+
+from typing import Any, Callable, Optional, TYPE_CHECKING, Union
+
+from .sweep import Field, point_to_data
+
+if TYPE_CHECKING:
+    from .base_function import BaseFunction
+
+# An output is a result key, a key with an index, or a callable returning a value from the result.
+Output = Union[str, tuple[str, int], Callable[[dict[str, Any]], float]]
+
+
+def output_value(result: dict[str, Any], output: Output) -> float:
+    """Extract a single value from a result."""
+    if callable(output):
+        return float(output(result))
+    if isinstance(output, str):
+        return float(result[output])
+    key, index = output
+    return float(result[key][index])
+
+
+class Objective:
+    """Evaluate an output of a function at points of some fields, remembering all evaluations.
+
+    :param fields: The fields as (key, column) tuples or keys (first column).
+    :param kwargs: Passed to `configure_run_read`, by default only changed fields are written.
+    """
+
+    def __init__(
+        self,
+        function: "BaseFunction",
+        fields: list[Union[str, Field]],
+        output: Output,
+        **kwargs,
+    ) -> None:
+        self.function = function
+        self.fields: list[Field] = [(f, 0) if isinstance(f, str) else (f[0], f[1]) for f in fields]
+        self.output = output
+        self.kwargs = kwargs
+        self.evaluations: dict[tuple[float, ...], tuple[float, dict[str, Any]]] = {}
+
+    @property
+    def runs(self) -> int:
+        return len(self.evaluations)
+
+    def __call__(self, *values: float) -> float:
+        """Return the output at the point, running the function if it was not yet evaluated."""
+        point = tuple(float(v) for v in values)
+        try:
+            return self.evaluations[point][0]
+        except KeyError:
+            pass
+        data = point_to_data(dict(zip(self.fields, point)))
+        result = self.function.configure_run_read(data, **{"force": False, **self.kwargs})
+        value = output_value(result, self.output)
+        self.evaluations[point] = value, result
+        return value
+
+
+def sample_1d(
+    function: "BaseFunction",
+    field: Union[str, Field],
+    start: float,
+    stop: float,
+    output: Output,
+    tolerance: float,
+    budget: int = 50,
+    initial: int = 5,
+    min_step: Optional[float] = None,
+    **kwargs,
+) -> tuple[list[float], list[float], list[dict[str, Any]]]:
+    """Sample `output` between `start` and `stop` of `field`, refining where it is curved.
+
+    Starting with `initial` equidistant points, the interval with the largest interpolation error
+    is bisected. The error of an interval is estimated from its width and the curvature at its end
+    points, which is calculated from their neighbours. Sampling stops when all errors are below
+    `tolerance` (in units of the output), the number of runs reaches `budget`, or all remaining
+    intervals are shorter than `min_step`.
+
+    :return: Sorted positions, output values, and results.
+    """
+    if initial < 3:
+        # the curvature needs three points
+        raise ValueError(f"At least 3 initial points are required, not {initial}.")
+    if budget < initial:
+        raise ValueError(f"The budget of {budget} runs is smaller than {initial} initial points.")
+    objective = Objective(function, [field], output, **kwargs)
+    if min_step is None:
+        min_step = abs(stop - start) * 1e-6
+    xs = [start + (stop - start) * i / (initial - 1) for i in range(initial)]
+    xs.sort()
+    ys = [objective(x) for x in xs]
+
+    while objective.runs < budget:
+        # second derivative at each inner point, estimated from its neighbours
+        curvature = [0.0] * len(xs)
+        for i in range(1, len(xs) - 1):
+            x0, x1, x2 = xs[i - 1 : i + 2]
+            y0, y1, y2 = ys[i - 1 : i + 2]
+            curvature[i] = 2 * abs((y2 - y1) / (x2 - x1) - (y1 - y0) / (x1 - x0)) / (x2 - x0)
+        # maximum error of the linear interpolation within each interval
+        candidates = [
+            (max(curvature[i], curvature[i + 1]) * (xs[i + 1] - xs[i]) ** 2 / 8, i)
+            for i in range(len(xs) - 1)
+            if xs[i + 1] - xs[i] > min_step
+        ]
+        if not candidates:
+            break
+        loss, index = max(candidates)
+        if loss < tolerance:
+            break
+        x = (xs[index] + xs[index + 1]) / 2
+        xs.insert(index + 1, x)
+        ys.insert(index + 1, objective(x))
+    results = [objective.evaluations[(x,)][1] for x in xs]
+    return xs, ys, results
+
+
+def sample_2d(
+    function: "BaseFunction",
+    fields: tuple[Union[str, Field], Union[str, Field]],
+    bounds: tuple[tuple[float, float], tuple[float, float]],
+    output: Output,
+    tolerance: float,
+    budget: int = 100,
+    initial: int = 3,
+    min_size: Optional[tuple[float, float]] = None,
+    **kwargs,
+) -> tuple[list[tuple[float, float]], list[float], list[dict[str, Any]]]:
+    """Sample `output` over a rectangle of two fields, refining cells where it is curved.
+
+    Starting with `initial` x `initial` points, the rectangular cell with the largest
+    interpolation error is split into four cells at its centre (up to eight new runs). The error of
+    a cell is the difference between the output at its centre and the bilinear interpolation of its
+    corners, such that linear trends are not refined. Cells, whose points exceed the remaining
+    budget, are not rated. Sampling stops, when all errors are below `tolerance`, the number of
+    runs reaches `budget` (it is never exceeded), or all cells are smaller than `min_size`.
+
+    :param bounds: (start, stop) of each field.
+    :return: The sampled points, the output values, and the results.
+    """
+    if initial < 2:
+        raise ValueError(f"At least 2 initial points per field are required, not {initial}.")
+    if budget < initial**2:
+        raise ValueError(f"The budget of {budget} runs is smaller than the initial grid.")
+    objective = Objective(function, list(fields), output, **kwargs)
+    (x_start, x_stop), (y_start, y_stop) = bounds
+    if min_size is None:
+        min_size = abs(x_stop - x_start) * 1e-6, abs(y_stop - y_start) * 1e-6
+    xs = [x_start + (x_stop - x_start) * i / (initial - 1) for i in range(initial)]
+    ys = [y_start + (y_stop - y_start) * i / (initial - 1) for i in range(initial)]
+    cells = [
+        (xs[i], xs[i + 1], ys[j], ys[j + 1]) for i in range(initial - 1) for j in range(initial - 1)
+    ]
+
+    def interpolation_error(cell: tuple[float, float, float, float]) -> float:
+        x0, x1, y0, y1 = cell
+        if abs(x1 - x0) <= min_size[0] and abs(y1 - y0) <= min_size[1]:
+            return 0
+        points = [(x, y) for x in (x0, x1) for y in (y0, y1)]
+        centre = (x0 + x1) / 2, (y0 + y1) / 2
+        missing = sum(
+            (float(x), float(y)) not in objective.evaluations for x, y in points + [centre]
+        )
+        if missing > budget - objective.runs:
+            return 0
+        # the bilinear interpolation at the centre is the mean of the corners
+        corners = [objective(x, y) for x, y in points]
+        return abs(objective(*centre) - sum(corners) / 4)
+
+    for x in xs:
+        for y in ys:
+            objective(x, y)
+    losses = [interpolation_error(cell) for cell in cells]
+    while objective.runs < budget and cells:
+        loss = max(losses)
+        if loss < tolerance:
+            break
+        index = losses.index(loss)
+        x0, x1, y0, y1 = cells.pop(index)
+        losses.pop(index)
+        xm, ym = (x0 + x1) / 2, (y0 + y1) / 2
+        for cell in ((x0, xm, y0, ym), (xm, x1, y0, ym), (x0, xm, ym, y1), (xm, x1, ym, y1)):
+            cells.append(cell)
+            losses.append(interpolation_error(cell))
+    points = list(objective.evaluations)
+    return (
+        points,  # type: ignore
+        [objective.evaluations[p][0] for p in points],
+        [objective.evaluations[p][1] for p in points],
+    )
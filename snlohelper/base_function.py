@@ -20,13 +20,55 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import logging
 import time
-from typing import Any, Optional, Protocol
+from typing import Any, Iterator, Optional, Protocol, Union
 
-from .utils import Point, gui, scale, get_content_complete, set_value
+from .instrumentation import measure, timed_phase
+from .result_schema import LabeledSchema, PositionalSchema
+from .utils import (
+    Point,
+    click,
+    get_content_complete,
+    get_window_offset,
+    set_value,
+    write_tabbed,
+)
 from .functions import Functions, open_function
 
 
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# Shadow states: the last known text of each field, keyed by (key, column), per function window.
+# There is one window per function and SNLO instance (window offset), such that all objects of a
+# function share the shadow state of that window.
+_shadows: dict[tuple[Functions, Point], dict[tuple[str, int], str]] = {}
+# The result rows read last from each function window.
+_last_results: dict[tuple[Functions, Point], list[str]] = {}
+# The shadow state of the run, whose result was accepted last, per function window.
+_result_configurations: dict[tuple[Functions, Point], dict[tuple[str, int], str]] = {}
+
+
+def get_shadow(
+    function: Functions, offset: Optional[Point] = None
+) -> dict[tuple[str, int], str]:
+    """Get the shadow state of the window of `function` at `offset` (default: current offset).
+
+    Everything, which writes into a function window, has to update or invalidate it.
+    """
+    if offset is None:
+        offset = get_window_offset()
+    return _shadows.setdefault((function, offset), {})
+
+
+def invalidate_shadows() -> None:
+    """Forget the shadow states and last results of all windows, e.g. after using SNLO by hand."""
+    _shadows.clear()
+    _last_results.clear()
+    _result_configurations.clear()
+
+
 class BaseFunction(Protocol):
     """Base class for a function window."""
 
@@ -36,22 +78,44 @@ class BaseFunction(Protocol):
     _result_pos: Point  # of the results field
     _close_pos: Point
     _configuration_pos: dict[str, list[Point]]  # of the configuration fields
+    # Order in which the tab key moves through the configuration fields as (key, column) tuples.
+    # If defined, `configure` enters all values in a single keystroke stream.
+    _tab_order: Optional[list[tuple[str, int]]] = None
+    # How the rows of the result field are parsed.
+    _result_schema: Union[LabeledSchema, PositionalSchema] = LabeledSchema()
+    # Seconds a run may take at least before a TimeoutError, for functions with long computations.
+    _run_timeout: float = 0
 
+    @timed_phase("open")
     def open(self) -> None:
         """Open the function."""
         open_function(self._function)
 
+    @timed_phase("run")
     def run(self) -> None:
-        """Click 'Run'."""
-        gui.click(*scale(*self._run_pos))
+        """Click 'Run'.
 
+        Remember, whether the run repeats the configuration of the result accepted last, such
+        that an unchanged result is expected, see `ResultWatcher`.
+        """
+        configuration = dict(self._get_shadow())
+        previous = _result_configurations.pop((self._function, get_window_offset()), None)
+        self._repeated_run = bool(configuration) and configuration == previous
+        self._run_configuration = configuration
+        click(self._run_pos)
+
+    @timed_phase("close")
     def close(self) -> None:
         """Click 'x'."""
         self.open()
-        gui.click(*scale(*self._close_pos))
+        click(self._close_pos)
 
+    @timed_phase("configure")
     def configure(
-        self, data: Optional[dict[str, Any | list[Any] | tuple[Any, ...]]] = None
+        self,
+        data: Optional[dict[str, Any | list[Any] | tuple[Any, ...]]] = None,
+        bulk: bool = False,
+        force: bool = True,
     ) -> None:
         """Configure the values and leave the config window open.
 
@@ -59,28 +123,76 @@ class BaseFunction(Protocol):
         change a single value in a row.
         For example `data={'Wavelengths (nm)': [1064.5, None, None]}` will set the first wavelength
         to 1064.5 nm while leaving the other wavelengths untouched.
+
+        :param bulk: Enter the values by tabbing through the fields, if the function defines a
+            tab order. Verify the tab order in SNLO before use, as a wrong order writes values
+            into wrong fields. By default, each field is set individually.
+        :param force: Write all values. If False, fields which already contain the value
+            (according to the shadow state of the values written or read before) are skipped.
+            Call `invalidate` or `resync` after changing values in SNLO by hand.
         """
         self.open()
-        if data is None:
+        if data is not None:
+            self._configure(data, bulk=bulk, force=force)
+
+    def _configure(self, data: dict[str, Any], bulk: bool = False, force: bool = True) -> None:
+        """Configure the values in the already open window, see `configure`."""
+        shadow = self._get_shadow()
+        values = {
+            (key, i): value
+            for key, i, value in iterate_fields(data)
+            if force or shadow.get((key, i)) != str(value)
+        }
+        if bulk and self._tab_order is not None:
+            self._configure_tabbed(values)
+        else:
+            for (key, i), value in values.items():
+                set_value(self._configuration_pos[key][i], value)
+        for field, value in values.items():
+            shadow[field] = str(value)
+
+    def _configure_tabbed(self, values: dict[tuple[str, int], Any]) -> None:
+        """Enter the values in tab order from the first to the last changed field."""
+        assert self._tab_order is not None
+        indices = [n for n, field in enumerate(self._tab_order) if field in values]
+        if indices:
+            fields = self._tab_order[min(indices) : max(indices) + 1]
+            key, i = fields[0]
+            write_tabbed(self._configuration_pos[key][i], [values.get(f) for f in fields])
+        # fields outside of the tab order
+        for (key, i), value in values.items():
+            if (key, i) not in self._tab_order:
+                set_value(self._configuration_pos[key][i], value)
+
+    def _get_shadow(self) -> dict[tuple[str, int], str]:
+        """Get the shadow state of the window at the current window offset, see `get_shadow`."""
+        return get_shadow(self._function)
+
+    def invalidate(self, keys: Optional[list[str]] = None) -> None:
+        """Forget the shadow state of the fields of `keys` (or of all fields)."""
+        shadow = self._get_shadow()
+        if keys is None:
+            shadow.clear()
             return
-        for key, value in data.items():
-            positions = self._configuration_pos[key]
-            if isinstance(value, (list, tuple)):
-                for i, val in enumerate(value):
-                    if val is not None:
-                        set_value(positions[i], val)
-            else:
-                if value is not None:
-                    set_value(positions[0], value)
+        for field in list(shadow):
+            if field[0] in keys:
+                del shadow[field]
+
+    def resync(self) -> dict[str, list[float | str]]:
+        """Read the configuration from SNLO, updating the shadow state, and return it."""
+        return self.get_configuration()
 
+    @timed_phase("get_configuration")
     def get_configuration(self) -> dict[str, list[float | str]]:
         """Read the current configuration."""
         self.open()
+        shadow = self._get_shadow()
         data = {}
         for key, positions in self._configuration_pos.items():
             d = []
-            for pos in positions:
+            for i, pos in enumerate(positions):
                 val = get_content_complete(pos)
+                shadow[(key, i)] = val
                 try:
                     d.append(float(val))
                 except ValueError:
@@ -88,30 +200,27 @@ class BaseFunction(Protocol):
             data[key] = d
         return data
 
+    @timed_phase("read")
     def read_results(self) -> list[str]:
-        return get_content_complete(self._result_pos).split("\r\n")
+        rows = get_content_complete(self._result_pos).split("\r\n")
+        _last_results[(self._function, get_window_offset())] = rows
+        return rows
+
+    def _previous_results(self) -> list[str]:
+        """Return the result rows read last from this window, reading them only if unknown."""
+        try:
+            return _last_results[(self._function, get_window_offset())]
+        except KeyError:
+            return self.read_results()
 
     def interpret_results(self, rows: list[str]) -> dict[str, Any]:
-        """Interpret the results and return them as a dictionary."""
-        data = {}
-        for row in rows:
-            # skip empty lines
-            if not row:
-                continue
-            if row == 'ERROR: No phase match found.':
-                raise Exception('No phase match found')
-            
-            text, values = row.split("=")
-            content = []
-            for element in values.split():
-                try:
-                    val = float(element)
-                except ValueError:
-                    val = element
-                content.append(val)
-            data[text.strip()] = content
-        return data
+        """Interpret the results and return them as a dictionary.
 
+        :raises PhaseMatchError: If SNLO did not find a phase match.
+        """
+        return self._result_schema.parse(rows)
+
+    @timed_phase("run_and_read")
     def run_and_read(
         self,
         waiting_time: float = 1,
@@ -119,25 +228,256 @@ class BaseFunction(Protocol):
         interval: float = 0.5,
         waiting_line_count: int = 3,
     ) -> dict[str, Any]:
-        """Run an analysis and return the result."""
-        self.run()
-        time.sleep(waiting_time)
-        for _ in range(max_tries):
-            rows = self.read_results()
-            if len(rows) > waiting_line_count:
-                break
-            time.sleep(interval)
+        """Run an analysis and return the result.
+
+        The result is read as soon as it differs from the one read last and is stable, see
+        `wait_for_results`.
 
+        :param waiting_time, max_tries: Raise a TimeoutError after
+            `waiting_time + max_tries * interval` seconds (at least `_run_timeout`) without a new
+            result.
+        :param interval: Longest time between two readings of the result.
+        :param waiting_line_count: A result has to contain more lines than this value.
+        """
+        previous = self._previous_results()
+        self.run()
+        with measure("wait", scope=type(self).__name__):
+            rows = self.wait_for_results(
+                previous,
+                timeout=max(waiting_time + max_tries * interval, self._run_timeout),
+                max_interval=interval,
+                waiting_line_count=waiting_line_count,
+            )
         # interpret results and save as dictionary:
-        return self.interpret_results(rows)
+        with measure("interpret", scope=type(self).__name__):
+            return self.interpret_results(rows)
+
+    def wait_for_results(
+        self,
+        previous: list[str],
+        timeout: float = 6,
+        max_interval: float = 0.5,
+        waiting_line_count: int = 3,
+        first_interval: float = 0.01,
+    ) -> list[str]:
+        """Wait until the results differ from `previous` and stop changing, and return them.
+
+        The results are read with exponentially increasing intervals, starting with
+        `first_interval` up to `max_interval`. Override it for a different strategy.
+        The previous result is only accepted, if the run repeated its configuration.
+
+        :raises TimeoutError: If there is no new result after `timeout` seconds.
+        """
+        watcher = self._watcher(previous, timeout, max_interval, waiting_line_count, first_interval)
+        while True:
+            time.sleep(watcher.delay)
+            if self._update_watcher(watcher, self.read_results()):
+                return watcher.rows
+
+    def _watcher(
+        self,
+        previous: list[str],
+        timeout: float,
+        max_interval: float,
+        waiting_line_count: int,
+        first_interval: float = 0.01,
+    ) -> "ResultWatcher":
+        """Create the result watcher of the last run."""
+        return ResultWatcher(
+            previous,
+            timeout,
+            max_interval,
+            waiting_line_count,
+            first_interval,
+            repeated=getattr(self, "_repeated_run", False),
+        )
+
+    def _update_watcher(self, watcher: "ResultWatcher", rows: list[str]) -> bool:
+        """Pass a reading to the watcher and remember the configuration of an accepted result."""
+        if watcher.update(rows):
+            key = (self._function, get_window_offset())
+            _result_configurations[key] = getattr(self, "_run_configuration", {})
+            return True
+        return False
 
     def configure_run_read(
-        self, data: Optional[dict[str, Any]] = None, **kwargs
+        self, data: Optional[dict[str, Any]] = None, force: bool = True, **kwargs
     ) -> dict[str, Any]:
-        """Configure and run an analysis and return the result."""
-        self.configure(data)
+        """Configure and run an analysis and return the result.
+
+        :param force: Write all values, see `configure`.
+        :param kwargs: Passed to `run_and_read`.
+        """
+        self.configure(data, force=force)
         return self.run_and_read(**kwargs)
 
+    def start(self, data: Optional[dict[str, Any]] = None) -> list[str]:
+        """Configure and run an analysis without waiting for it.
+
+        :return: The result rows before the run, see `wait_for_results`.
+        """
+        self.configure(data)
+        previous = self._previous_results()
+        self.run()
+        return previous
+
+    async def run_and_read_async(
+        self,
+        waiting_time: float = 1,
+        max_tries: int = 10,
+        interval: float = 0.5,
+        waiting_line_count: int = 3,
+    ) -> dict[str, Any]:
+        """Run an analysis and return the result without blocking the event loop.
+
+        The GUI operations are executed by the GUI executor, see `run_and_read` for the parameters.
+        """
+        from .gui_executor import get_gui_executor
+
+        gui = get_gui_executor()
+        async with gui.session():
+            previous = await gui.call(self._previous_results)
+            await gui.call(self.run)
+            return await self._wait_and_interpret_async(
+                previous, waiting_time, max_tries, interval, waiting_line_count
+            )
+
+    async def configure_run_read_async(
+        self,
+        data: Optional[dict[str, Any]] = None,
+        waiting_time: float = 1,
+        max_tries: int = 10,
+        interval: float = 0.5,
+        waiting_line_count: int = 3,
+    ) -> dict[str, Any]:
+        """Configure and run an analysis and return the result without blocking the event loop.
+
+        See `run_and_read` for the parameters.
+        """
+        from .gui_executor import get_gui_executor
+
+        gui = get_gui_executor()
+        async with gui.session():
+            previous = await gui.call(self.start, data)
+            return await self._wait_and_interpret_async(
+                previous, waiting_time, max_tries, interval, waiting_line_count
+            )
+
+    async def _wait_and_interpret_async(
+        self,
+        previous: list[str],
+        waiting_time: float,
+        max_tries: int,
+        interval: float,
+        waiting_line_count: int,
+    ) -> dict[str, Any]:
+        import asyncio
+
+        from .gui_executor import get_gui_executor
+
+        gui = get_gui_executor()
+        watcher = self._watcher(
+            previous,
+            max(waiting_time + max_tries * interval, self._run_timeout),
+            interval,
+            waiting_line_count,
+        )
+        while True:
+            await asyncio.sleep(watcher.delay)
+            if self._update_watcher(watcher, await gui.call(self.read_results)):
+                return self.interpret_results(watcher.rows)
+
+    def sweep(
+        self,
+        parameters: dict[Any, Any],
+        journal: Optional[str] = None,
+        ignore_errors: bool = False,
+        **kwargs,
+    ) -> Iterator[tuple[dict[tuple[str, int], Any], Optional[dict[str, Any]]]]:
+        """Run the function for each point of a grid and yield point and result.
+
+        See `sweep.sweep` for the parameters.
+        """
+        from .sweep import sweep
+
+        return sweep(self, parameters, journal=journal, ignore_errors=ignore_errors, **kwargs)
+
+
+class ResultWatcher:
+    """Decide from successive readings of the result field, whether a new result is complete.
+
+    A new result differs from `previous`, has more than `waiting_line_count` lines, and is stable
+    between two readings. Read again after `delay` seconds, which starts with `first_interval` and
+    doubles up to `max_interval`, until `update` returns True.
+    SNLO does not clear the result while it computes, so a result equal to `previous` is only
+    accepted for a `repeated` run of the configuration, which gave `previous`.
+    """
+
+    def __init__(
+        self,
+        previous: list[str],
+        timeout: float = 6,
+        max_interval: float = 0.5,
+        waiting_line_count: int = 3,
+        first_interval: float = 0.01,
+        repeated: bool = False,
+    ) -> None:
+        self.previous = self.rows = previous
+        self.timeout = timeout
+        self.max_interval = max_interval
+        self.waiting_line_count = waiting_line_count
+        self.first_interval = self.delay = first_interval
+        self.repeated = repeated
+        self.changed = False
+        self.deadline = time.perf_counter() + timeout
+
+    def update(self, new_rows: list[str]) -> bool:
+        """Process a reading and return whether `rows` is the result.
+
+        :raises TimeoutError: If there is no new result after `timeout` seconds.
+        """
+        if self.changed and new_rows == self.rows:
+            return True
+        if (
+            self.repeated
+            and not self.changed
+            and new_rows == self.previous
+            and len(new_rows) > self.waiting_line_count
+        ):
+            return True
+        if (
+            not self.changed
+            and new_rows != self.previous
+            and len(new_rows) > self.waiting_line_count
+        ):
+            self.changed = True
+            self.delay = self.first_interval  # check stability quickly
+        else:
+            self.delay = min(2 * self.delay, self.max_interval)
+        self.rows = new_rows
+        if time.perf_counter() > self.deadline:
+            raise TimeoutError(f"No new stable result after {self.timeout} s.")
+        return False
+
+
+def iterate_fields(data: dict[str, Any]) -> Iterator[tuple[str, int, Any]]:
+    """Iterate over a configuration dictionary yielding key, column, and value of each field.
+
+    Single values belong to the first column, None values are skipped.
+    """
+    for key, value in data.items():
+        if isinstance(value, (list, tuple)):
+            for i, val in enumerate(value):
+                if val is not None:
+                    yield key, i, val
+        elif value is not None:
+            yield key, 0, value
+
+
+def generate_tab_order(configuration_pos: dict[str, list[Point]]) -> list[tuple[str, int]]:
+    """Generate a tab order going through the fields row by row, left to right."""
+    return [(key, i) for key, positions in configuration_pos.items() for i in range(len(positions))]
+
 
 def generate_position_dict(
     first_position: Point,
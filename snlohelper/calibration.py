@@ -0,0 +1,118 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Calibration of the input latency
+================================
+
+Find the smallest delay after each GUI action, which still works reliably with the running SNLO,
+and store it (with a safety margin) as latency profile. The pyautogui backend loads that profile
+automatically.
+
+Start SNLO, do not touch mouse and keyboard, and call `calibrate_latency()`.
+"""
+
+import logging
+from typing import Optional, Sequence
+
+from . import utils
+from .instrumentation import InstrumentedBackend
+from .base_function import BaseFunction
+from .ref_index import RefractiveIndex
+
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+CANDIDATES = (0, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+
+def verify(position: utils.Point, values: Sequence[str]) -> bool:
+    """Write each value into the field at position and check that it is read back."""
+    for value in values:
+        utils.set_value(position, value)
+        if utils.get_content_complete(position).strip() != value:
+            return False
+    return True
+
+
+def calibrate_latency(
+    function: Optional[BaseFunction] = None,
+    key: str = "Temperature",
+    candidates: Sequence[float] = CANDIDATES,
+    repetitions: int = 3,
+    passes: int = 3,
+    margin: float = 1.5,
+    file_name: Optional[str] = utils.LATENCY_PROFILE_FILE,
+) -> dict[str, float]:
+    """Determine the delay per action, apply it to the current backend, and save it.
+
+    Each action is tested with increasing delays out of `candidates`, while all other actions use
+    the delays found so far (or the conservative ones). The first delay passing all `passes` tests
+    is multiplied by `margin`, but raised at least to the next larger candidate, such that a
+    passing delay of 0 s gets a margin, too (at most the conservative value). If no candidate
+    works or the final verification of the whole profile fails, the conservative values are used.
+
+    :param function: Function whose field `key` is used for testing, by default "Ref. Ind.".
+    :param repetitions: Number of values written and read back per test.
+    :param passes: Number of tests a delay has to pass.
+    :param margin: Factor applied to the shortest working delay.
+    :param file_name: Where to store the profile, None does not store it.
+    """
+    backend = utils.get_backend()
+    if isinstance(backend, InstrumentedBackend):
+        backend = backend.backend
+    if not hasattr(backend, "delays"):
+        raise TypeError(f"The backend {backend} does not support delays.")
+    if function is None:
+        function = RefractiveIndex()
+    function.open()
+    position = function._configuration_pos[key][0]
+    backend.delays = dict(utils.CONSERVATIVE_DELAYS)  # type: ignore
+    original = utils.get_content_complete(position)
+    values = [f"{17 + i}.{i + 3}" for i in range(repetitions)]
+
+    profile = dict(utils.CONSERVATIVE_DELAYS)
+    try:
+        for action in utils.ACTIONS:
+            ordered = sorted(candidates)
+            for delay, larger in zip(ordered, ordered[1:] + [profile[action]]):
+                if delay >= profile[action]:
+                    break
+                backend.delays = {**profile, action: delay}  # type: ignore
+                if all(verify(position, values) for _ in range(passes)):
+                    profile[action] = min(max(delay * margin, larger), profile[action])
+                    break
+            log.info(f"Delay for '{action}': {profile[action]} s.")
+
+        backend.delays = profile  # type: ignore
+        if not all(verify(position, values) for _ in range(passes)):
+            log.warning("Verification of the latency profile failed, using conservative delays.")
+            profile = dict(utils.CONSERVATIVE_DELAYS)
+            backend.delays = profile  # type: ignore
+        utils.set_value(position, original)
+    finally:
+        # the field was written directly, bypassing the shadow state
+        function.invalidate([key])
+    if file_name is not None:
+        utils.save_latency_profile(profile, file_name)
+    return profile
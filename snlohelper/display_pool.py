@@ -0,0 +1,154 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Display pool
+============
+
+Run SNLO instances on several X displays (e.g. SNLO under Wine on virtual displays), each
+controlled by its own worker process::
+
+    with DisplayPool([":1", ":2", ":3"]) as pool:
+        for result in pool.map(Functions.TWOD_MIX_SP, configurations):
+            print(result["Output pulse energy (J)"])
+
+Each worker is a new ("spawn") process, which sets `DISPLAY` before the GUI backend is created
+(pyautogui connects to the display at its import) and sets up its own `MainWindow`. The main
+script is imported by every worker, so it must not import pyautogui at module level.
+The results are returned in the order of submission.
+For tests, pass a `backend_factory`, for example `SimulatedSNLO`, which creates the backend of
+each worker.
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import logging
+import multiprocessing
+import os
+import sys
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from . import utils
+from .functions import Functions
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# state of a worker process
+_main_window: Any = None
+_functions: dict[Functions, Any] = {}
+
+
+def _initialize(
+    displays: "multiprocessing.Queue[str]",
+    backend_factory: Optional[Callable[[], utils.GuiBackend]],
+    screenfactors: Optional[utils.Point],
+    layout_file: Optional[str],
+) -> None:
+    """Take a display and set up the GUI backend and main window of a worker process."""
+    from .main_window import MainWindow
+
+    global _main_window
+    display = displays.get()
+    if "pyautogui" in sys.modules:
+        raise RuntimeError(
+            f"pyautogui was imported before the worker could select display {display}."
+        )
+    os.environ["DISPLAY"] = display
+    utils.set_backend(None if backend_factory is None else backend_factory())
+    _main_window = MainWindow(screenfactors=screenfactors, layout_file=layout_file)
+    log.info(f"Worker {os.getpid()} uses display {display}.")
+
+
+def _configure_run_read(
+    function: Functions, data: Optional[dict[str, Any]], kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    from .main_window import function_classes
+
+    try:
+        function_object = _functions[function]
+    except KeyError:
+        function_object = _functions[function] = function_classes[function]()
+    return function_object.configure_run_read(data, **kwargs)
+
+
+class DisplayPool:
+    """A pool of worker processes, each owning one display with an SNLO instance.
+
+    :param displays: X displays, for example `[":1", ":2"]`, one worker per display.
+    :param backend_factory: Creates the GUI backend in each worker, by default pyautogui.
+    :param screenfactors, layout_file: Passed to the `MainWindow` of each worker.
+    :param mp_context: Multiprocessing context, see `concurrent.futures.ProcessPoolExecutor`.
+        By default "spawn", as forked workers would share the X connection of the parent.
+    """
+
+    def __init__(
+        self,
+        displays: list[str],
+        backend_factory: Optional[Callable[[], utils.GuiBackend]] = None,
+        screenfactors: Optional[utils.Point] = None,
+        layout_file: Optional[str] = None,
+        mp_context: Optional[Any] = None,
+    ) -> None:
+        context = multiprocessing.get_context("spawn") if mp_context is None else mp_context
+        queue = context.Queue()
+        for display in displays:
+            queue.put(display)
+        self.displays = displays
+        self.executor = ProcessPoolExecutor(
+            max_workers=len(displays),
+            mp_context=context,
+            initializer=_initialize,
+            initargs=(queue, backend_factory, screenfactors, layout_file),
+        )
+
+    def __enter__(self) -> "DisplayPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for the submitted jobs and stop the workers."""
+        self.executor.shutdown()
+
+    def submit(
+        self, function: Union[str, Functions], data: Optional[dict[str, Any]] = None, **kwargs
+    ) -> "Future[dict[str, Any]]":
+        """Submit a configuration of a function and return the future of its result.
+
+        :param kwargs: Passed to `configure_run_read`.
+        """
+        return self.executor.submit(_configure_run_read, Functions(function), data, kwargs)
+
+    def map(
+        self,
+        function: Union[str, Functions],
+        configurations: Iterable[Optional[dict[str, Any]]],
+        **kwargs,
+    ) -> Iterator[dict[str, Any]]:
+        """Run all configurations of a function and yield the results in their order.
+
+        An exception of a job is raised, when its result is due.
+        """
+        futures = [self.submit(function, data, **kwargs) for data in configurations]
+        for future in futures:
+            yield future.result()
@@ -0,0 +1,110 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+File watch
+==========
+
+Wait for SNLO to write its output files instead of sleeping a fixed time::
+
+    watcher = FileWatcher(["ID_BEAM.dat", "SIG_BEAM.dat"])  # before the run
+    click((400, 260))  # let SNLO write the files
+    id_beam, sig_beam = watcher.load()
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+
+import numpy as np
+
+from .import_snlo_file import import_snlo_file
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+Signature = Optional[tuple[int, int]]  # size and modification time, None if missing
+
+
+def file_signature(file_name: str) -> Signature:
+    try:
+        stat = os.stat(file_name)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class FileWatcher:
+    """Record the state of files and wait until all of them are rewritten.
+
+    Create it before starting the run, which writes the files.
+    """
+
+    def __init__(self, file_names: list[str], file_path: str = "C:/SNLO/") -> None:
+        self.file_names = file_names
+        self.file_path = file_path
+        self.before = {name: file_signature(file_path + name) for name in file_names}
+
+    def wait(
+        self,
+        timeout: float = 10,
+        stable_time: float = 0.05,
+        first_interval: float = 0.01,
+        max_interval: float = 0.1,
+    ) -> None:
+        """Wait until every file changed and its size and modification time stayed the same for
+        `stable_time` seconds.
+
+        The files are checked with exponentially increasing intervals.
+
+        :raises TimeoutError: If the files are not written within `timeout` seconds.
+        """
+        start = time.perf_counter()
+        deadline = start + timeout
+        pending = dict(self.before)
+        last_change = {name: start for name in pending}
+        delay = first_interval
+        while True:
+            now = time.perf_counter()
+            for name, previous in list(pending.items()):
+                signature = file_signature(self.file_path + name)
+                if signature != previous:
+                    pending[name] = signature
+                    last_change[name] = now
+                    continue
+                if signature != self.before[name] and now - last_change[name] >= stable_time:
+                    del pending[name]
+            if not pending:
+                return
+            if now > deadline:
+                raise TimeoutError(f"The files {list(pending)} were not written in {timeout} s.")
+            time.sleep(delay)
+            delay = min(2 * delay, max_interval)
+
+    def load(self, timeout: float = 10, **kwargs) -> list[np.ndarray]:
+        """Wait for the files and import them in the given order.
+
+        :param kwargs: Passed to `import_snlo_file`, e.g. `cache`.
+        """
+        self.wait(timeout=timeout)
+        return [import_snlo_file(name, self.file_path, **kwargs) for name in self.file_names]
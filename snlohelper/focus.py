@@ -20,11 +20,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Optional
+import logging
+import math
+from typing import Any, Optional
 
-from .base_function import BaseFunction
+from .base_function import BaseFunction, get_shadow
 from .functions import open_function, Functions
-from .utils import Point, gui, scale, set_value, get_value_complete
+from .utils import Point, click, set_value, get_value_complete
 
 
 # coordinates of the Focus-function (in FHD standard)
@@ -42,6 +44,12 @@ _dict_focus: dict[str, Point] = {
     "1e^2": (166, 216),
 }
 
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# ratio of the FWHM (intensity) diameter to the 1/e^2 radius of a gaussian beam
+FWHM_FACTOR = math.sqrt(2 * math.log(2))
+
 
 def focus(
     wavelength_nm: float, ref_index: float, fwhm_mm: float, focus_pos_mm: float
@@ -52,14 +60,20 @@ def focus(
     return: zr, diameter (FWHM), radcurv, angle
     """
     open_function(Functions.FOCUS)
-    gui.leftClick(*scale(*_dict_focus["fwhm"]))
-    set_value(_dict_focus["Wavelength (nm)"], wavelength_nm)
-    set_value(_dict_focus["Refractive Index"], ref_index)
-    set_value(_dict_focus["Waist size (mm)"], fwhm_mm)
-    set_value(_dict_focus["Face to focus (mm)"], focus_pos_mm)
-    # Setting 'Dist. to focus (mm)' equal to 'Face to focus (mm)' gives parameters in air at the
-    # input face
-    set_value(_dict_focus["Dist. to focus (mm)"], focus_pos_mm)
+    click(_dict_focus["fwhm"])
+    inputs = {
+        "Wavelength (nm)": wavelength_nm,
+        "Refractive Index": ref_index,
+        "Waist size (mm)": fwhm_mm,
+        "Face to focus (mm)": focus_pos_mm,
+        # Setting 'Dist. to focus (mm)' equal to 'Face to focus (mm)' gives parameters in air at
+        # the input face
+        "Dist. to focus (mm)": focus_pos_mm,
+    }
+    shadow = get_shadow(Functions.FOCUS)
+    for key, value in inputs.items():
+        set_value(_dict_focus[key], value)
+        shadow[(key, 0)] = str(value)
     # readout
     zr = get_value_complete(_dict_focus["Rayleigh z in xtal (mm)"])
     diameter = get_value_complete(_dict_focus["Beam size (mm)"])
@@ -68,6 +82,67 @@ def focus(
     return zr, diameter, radcurv, angle
 
 
+def gaussian_focus(
+    wavelength_nm: Any, ref_index: Any, fwhm_mm: Any, focus_pos_mm: Any, verify: int = 0
+) -> tuple[Any, Any, Any, Any]:
+    """Calculate the results of `focus` for a gaussian beam without SNLO.
+
+    The inputs may be numpy arrays, which are broadcast against each other.
+    The beam is focused `focus_pos_mm` behind the input face into the crystal, the diameter,
+    radius of curvature, and angle are given in air at the input face.
+
+    inputs: wavelength_nm, ref_index, waist_size_mm (FWHM), focus_pos_mm
+    return: zr, diameter (FWHM), radcurv, angle
+    :param verify: Number of randomly chosen inputs to compare with SNLO's Focus function.
+    """
+    import numpy as np
+
+    wavelength_mm = np.asarray(wavelength_nm, dtype=float) * 1e-6
+    n = np.asarray(ref_index, dtype=float)
+    z = np.asarray(focus_pos_mm, dtype=float)
+    fwhm = np.asarray(fwhm_mm, dtype=float)
+    w0 = fwhm / FWHM_FACTOR  # 1/e^2 radius
+    # at the focus (z=0) the radius of curvature is infinite
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zr = np.pi * w0**2 * n / wavelength_mm
+        diameter = fwhm * np.sqrt(1 + (z / zr) ** 2)
+        # radius of curvature in the crystal divided by n for the refraction at the face
+        radcurv = (z + zr**2 / z) / n
+        angle = FWHM_FACTOR * wavelength_mm / (np.pi * w0) * 1e3
+    if verify and not verify_gaussian_focus(
+        wavelength_nm, ref_index, fwhm_mm, focus_pos_mm, samples=verify
+    ):
+        raise ValueError("The gaussian beam calculation does not agree with SNLO.")
+    return zr, diameter, radcurv, angle
+
+
+def verify_gaussian_focus(
+    wavelength_nm: Any,
+    ref_index: Any,
+    fwhm_mm: Any,
+    focus_pos_mm: Any,
+    samples: int = 3,
+    rtol: float = 1e-2,
+) -> bool:
+    """Compare `gaussian_focus` with SNLO's `focus` for `samples` randomly chosen inputs."""
+    import numpy as np
+
+    inputs = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (wavelength_nm, ref_index, fwhm_mm, focus_pos_mm))
+    )
+    rng = np.random.default_rng()
+    indices = rng.choice(inputs[0].size, size=min(samples, inputs[0].size), replace=False)
+    agree = True
+    for index in indices:
+        args = [float(v.flat[index]) for v in inputs]
+        snlo = focus(*args)
+        native = gaussian_focus(*args)
+        if not np.allclose(native, snlo, rtol=rtol):
+            log.warning(f"Focus for {args}: SNLO gives {snlo}, calculation {native}.")
+            agree = False
+    return agree
+
+
 class Focus(BaseFunction):
     _function = Functions.FOCUS
 
@@ -22,7 +22,7 @@
 
 from enum import StrEnum
 
-from .utils import Point, gui, scale
+from .utils import Point, click
 
 
 # coordinates of the functions (in FHD standard)
@@ -73,4 +73,4 @@ class Functions(StrEnum):
 
 def open_function(key: str | Functions) -> None:
     """opens function according to key"""
-    gui.click(*scale(*_functions_coord[key]))
+    click(_functions_coord[key])
@@ -0,0 +1,197 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Gaussian peaks
+==============
+
+Estimate centre, amplitude, and width of many peaks (spectra, pulse traces) at once::
+
+    peaks = estimate_gaussians(spectra["detuning"], np.stack([spectra["red1"], spectra["red2"]]))
+    print(peaks.fwhm)
+
+The estimates are vectorised over all traces: a weighted least squares parabola fit to the
+logarithm of the points above half the maximum (default) or the moments of the trace.
+Pass `refine=True` to refine them with a nonlinear least squares fit (scipy) in a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import math
+from typing import Optional
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# ratio of the full width at half maximum to the standard deviation
+SIGMA_TO_FWHM = 2 * math.sqrt(2 * math.log(2))
+
+
+def gauss(x, x0, a, sigma):
+    """Gaussian function"""
+    return a * np.exp(-((x - x0) ** 2) / (2 * sigma**2))
+
+
+class GaussianPeaks:
+    """Centre, amplitude, and standard deviation (arrays with one value per trace).
+
+    `success` is False for traces, whose estimate (or refinement) failed.
+    """
+
+    __slots__ = ("centre", "amplitude", "sigma", "success")
+
+    def __init__(
+        self,
+        centre: np.ndarray,
+        amplitude: np.ndarray,
+        sigma: np.ndarray,
+        success: Optional[np.ndarray] = None,
+    ) -> None:
+        self.centre = centre
+        self.amplitude = amplitude
+        self.sigma = sigma
+        self.success = np.isfinite(sigma) if success is None else success
+
+    @property
+    def fwhm(self) -> np.ndarray:
+        return SIGMA_TO_FWHM * np.abs(self.sigma)
+
+    def __len__(self) -> int:
+        return len(self.centre)
+
+    def __getitem__(self, index: int) -> tuple[float, float, float]:
+        """Parameters of one trace in the order of `gauss`: centre, amplitude, sigma."""
+        return self.centre[index], self.amplitude[index], self.sigma[index]
+
+
+def _prepare(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    x = np.broadcast_to(np.asarray(x, dtype=np.float64), y.shape)
+    return x, y
+
+
+def moment_estimates(x: np.ndarray, y: np.ndarray) -> GaussianPeaks:
+    """Estimate the peaks of traces `y` (2D, one trace per row) from their moments.
+
+    :param x: Positions, either common to all traces (1D) or one row per trace.
+    """
+    x, y = _prepare(x, y)
+    weights = np.clip(y, 0, None)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = weights.sum(axis=1)
+        centre = (weights * x).sum(axis=1) / total
+        variance = (weights * (x - centre[:, None]) ** 2).sum(axis=1) / total
+        sigma = np.sqrt(variance)
+    return GaussianPeaks(centre, y.max(axis=1), np.where(total > 0, sigma, np.nan))
+
+
+def log_parabola_estimates(x: np.ndarray, y: np.ndarray, fraction: float = 0.5) -> GaussianPeaks:
+    """Estimate the peaks of traces `y` with a parabola fit to the logarithm of the points above
+    `fraction` of the maximum of each trace (weighted by y^2, see Guo, IEEE Signal Process. Mag.
+    28, 134 (2011)).
+
+    Traces with fewer than three such points fall back to the moment estimate.
+
+    :param x: Positions, either common to all traces (1D) or one row per trace.
+    """
+    x, y = _prepare(x, y)
+    peak = np.argmax(y, axis=1)
+    rows = np.arange(len(y))
+    maximum = y[rows, peak]
+    x0 = x[rows, peak][:, None]
+    scale = np.ptp(x, axis=1)[:, None]
+    scale[scale == 0] = 1
+    mask = y > fraction * maximum[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = np.where(mask, (x - x0) / scale, 0)  # normalised for a well conditioned system
+        log_y = np.where(mask, np.log(np.where(mask, y, 1)), 0)
+        w = np.where(mask, y**2, 0)
+        s = [(w * u**k).sum(axis=1) for k in range(5)]
+        t = [(w * u**k * log_y).sum(axis=1) for k in range(3)]
+        matrix = np.stack(
+            [np.stack(s[0:3], axis=-1), np.stack(s[1:4], axis=-1), np.stack(s[2:5], axis=-1)],
+            axis=1,
+        )
+        enough = mask.sum(axis=1) >= 3
+        matrix[~enough] = np.eye(3)
+        c0, c1, c2 = np.linalg.solve(matrix, np.stack(t, axis=-1)[..., None])[..., 0].T
+        valid = enough & (c2 < 0)
+        sigma = np.sqrt(-1 / (2 * c2)) * scale[:, 0]
+        centre = x0[:, 0] - c1 / (2 * c2) * scale[:, 0]
+        amplitude = np.exp(c0 - c1**2 / (4 * c2))
+    if valid.all():
+        return GaussianPeaks(centre, amplitude, sigma)
+    moments = moment_estimates(x, y)
+    return GaussianPeaks(
+        np.where(valid, centre, moments.centre),
+        np.where(valid, amplitude, moments.amplitude),
+        np.where(valid, sigma, moments.sigma),
+    )
+
+
+def _refine(args: tuple[np.ndarray, np.ndarray, tuple[float, float, float]]):
+    from scipy.optimize import curve_fit
+
+    x, y, p0 = args
+    try:
+        popt, _ = curve_fit(gauss, x, y, p0=p0)
+    except (RuntimeError, ValueError):
+        return p0, False
+    return tuple(popt), True
+
+
+def estimate_gaussians(
+    x: np.ndarray,
+    y: np.ndarray,
+    method: str = "log_parabola",
+    refine: bool = False,
+    max_workers: Optional[int] = None,
+) -> GaussianPeaks:
+    """Estimate centre, amplitude, and width of a gaussian peak in each trace.
+
+    :param x: Positions, either common to all traces (1D) or one row per trace.
+    :param y: Traces, one per row (or a single 1D trace).
+    :param method: "log_parabola" or "moments".
+    :param refine: Refine each estimate with a nonlinear least squares fit in a process pool.
+        If a fit fails, the estimate is kept and `success` is False.
+    :param max_workers: Number of processes for the refinement.
+    """
+    if method == "log_parabola":
+        peaks = log_parabola_estimates(x, y)
+    elif method == "moments":
+        peaks = moment_estimates(x, y)
+    else:
+        raise ValueError(f"Unknown method '{method}'.")
+    if not refine:
+        return peaks
+    x, y = _prepare(x, y)
+    jobs = [(x[i], y[i], peaks[i]) for i in range(len(y))]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        fits = list(executor.map(_refine, jobs, chunksize=max(1, len(jobs) // 64)))
+    parameters = np.array([p for p, _ in fits], dtype=np.float64).reshape(-1, 3)
+    success = np.array([ok for _, ok in fits], dtype=bool)
+    failed = int((~success).sum())
+    if failed:
+        log.warning(f"Refinement failed for {failed} of {len(jobs)} traces, keeping estimates.")
+    return GaussianPeaks(*parameters.T, success=success & peaks.success)
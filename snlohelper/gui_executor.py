@@ -0,0 +1,119 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+GUI executor
+============
+
+A single thread owns all GUI access. Other threads submit work and get futures::
+
+    future = get_gui_executor().submit(mix.configure_run_read, data)
+    ...  # do something else
+    result = future.result()
+
+Coroutines use the async methods of the function classes, which wait for SNLO without blocking
+the event loop::
+
+    result = await mix.configure_run_read_async(data)
+
+Work submitted to the executor runs in submission order, such that concurrent callers do not mix
+their clicks. A coroutine holds a session for a whole analysis, during which no other work runs.
+Do not call GUI methods directly from other threads while the executor is in use.
+"""
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import threading
+from typing import AsyncIterator, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# The executor, whose session the current task holds.
+_session_owner: ContextVar[Optional["GuiExecutor"]] = ContextVar("_session_owner", default=None)
+
+
+class GuiExecutor:
+    """Execute all GUI operations in a single thread."""
+
+    def __init__(self) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snlo-gui")
+        # waits for the lock before handing work to the GUI thread
+        self._waiter = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snlo-gui-wait")
+        self.lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., T], *args, **kwargs) -> "Future[T]":
+        """Execute `fn` in the GUI thread and return a future of its return value.
+
+        Outside of a session, `fn` waits for running sessions and holds the lock while it runs.
+        """
+        if _session_owner.get() is self:
+            return self.executor.submit(fn, *args, **kwargs)
+        return self._waiter.submit(self._run_locked, fn, *args, **kwargs)
+
+    def _run_locked(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        with self.lock:
+            return self.executor.submit(fn, *args, **kwargs).result()
+
+    async def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Execute `fn` in the GUI thread and return its return value."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """Hold the lock while a coroutine runs an analysis.
+
+        The GUI thread executes single operations, the lock prevents other coroutines (of any
+        event loop) and work submitted from other threads from changing the configuration or the
+        windows between them.
+        """
+        if _session_owner.get() is self:  # nested session
+            yield
+            return
+        acquired = asyncio.get_running_loop().run_in_executor(None, self.lock.acquire)
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            acquired.add_done_callback(lambda _: self.lock.release())
+            raise
+        token = _session_owner.set(self)
+        try:
+            yield
+        finally:
+            _session_owner.reset(token)
+            self.lock.release()
+
+    def shutdown(self) -> None:
+        self._waiter.shutdown()
+        self.executor.shutdown()
+
+
+def get_gui_executor() -> GuiExecutor:
+    """Get the GUI executor, creating it if necessary."""
+    global gui_executor
+    try:
+        return gui_executor
+    except NameError:
+        gui_executor = GuiExecutor()
+        return gui_executor
+
@@ -20,25 +20,89 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+"""
+Import of SNLO output files
+===========================
+
+SNLO writes its output files (e.g. `OPA2D_SP.dat`, `ID_BEAM.dat`) as rows of numbers in
+exponential notation. If a number is negative, it may be fused to its predecessor without
+whitespace, e.g. `9.206897E-100-1.616264E-2`.
+
+Very large files can be read in blocks of rows with `iter_snlo_file` or reduced to statistics per
+column with `reduce_snlo_file`, both with constant memory::
+
+    stats = reduce_snlo_file("OPA2D_SP.dat")
+    print(stats.maximum, stats.mean, stats.std)
+"""
+
+import itertools
 import re
+from typing import Iterator, Optional, Union
+import warnings
 
 import numpy as np
 
+from .parsed_cache import ParsedFileCache, get_default_cache
 
-def import_snlo_file(file_name: str, file_path: str = "C:/SNLO/"):
-    """import a file generated by SNLO, specified by filename and return array (no header)"""
-    with open(file_path + file_name, "r") as f:
-        input = f.readlines()
-    data = []
-    e_numbers = re.compile(r"-*[\d.]*?E-*[+]*\d*")
-    r""" Regex
-        -*        "-" or nothing
-        [\d.]*?   decimal number (0 or more characters)
-        -*        "-" or nothing
-        [+]*      "+" or nothing
-        \d*       decimal number (0 or more characters)
+e_numbers = re.compile(r"-*[\d.]*?E-*[+]*\d*")
+r""" Regex
+    -*        "-" or nothing
+    [\d.]*?   decimal number (0 or more characters)
+    -*        "-" or nothing
+    [+]*      "+" or nothing
+    \d*       decimal number (0 or more characters)
+"""
+
+
+def import_snlo_file(
+    file_name: str, file_path: str = "C:/SNLO/", cache: Union[bool, ParsedFileCache] = False
+) -> np.ndarray:
+    """import a file generated by SNLO, specified by filename and return array (no header)
+
+    :param cache: Use a binary cache (True for the default one), see `parsed_cache`. The
+        returned array is read only in that case.
+    """
+    if cache:
+        cache = get_default_cache() if cache is True else cache
+        return cache.load(file_path + file_name, _parse_file)
+    return _parse_file(file_path + file_name)
+
+
+def _parse_file(file_name: str) -> np.ndarray:
+    with open(file_name, "rb") as f:
+        text = f.read()
+    data = parse_snlo_text(text)
+    if data is None:
+        return _import_snlo_lines(text.decode().splitlines())
+    return data
+
+
+def parse_snlo_text(text: bytes) -> Optional[np.ndarray]:
+    """Parse the text of an SNLO file in a single pass into a 2D float64 array.
+
+    The text is split into numbers and converted by numpy's C parser into a single array.
+    Return None if the text does not consist of rows with the same number of plain numbers.
     """
-    for i in input:
+    # A minus sign starts a new number unless it belongs to an exponent.
+    text = text.replace(b"E-", b"E~").replace(b"-", b" -").replace(b"E~", b"E-").strip()
+    lines = text.split(b"\n")
+    columns = len(lines[0].split())
+    # the total count of numbers cannot detect rows of different widths, e.g. 2, 1, 3, 2
+    if any(len(line.split()) != columns for line in lines):
+        return None
+    rows = len(lines)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        data = np.fromstring(text, dtype=np.float64, sep=" ")  # type: ignore
+    if columns == 0 or data.size != rows * columns:
+        return None
+    return data.reshape(rows, columns)
+
+
+def _import_snlo_lines(lines: list[str]) -> np.ndarray:
+    """Import line by line with a regular expression, which is slow but tolerant."""
+    data = []
+    for i in lines:
         temp = []
         # old implementation, suffers from strings without whitespace, e.g.:
         #    '9.206897E-100-1.616264E-2'
@@ -49,4 +113,76 @@ def import_snlo_file(file_name: str, file_path: str = "C:/SNLO/"):
         for item in new_element:
             temp.append(float(item))
         data.append(temp)
-    return np.array(data.copy())
+    return np.array(data)
+
+
+def iter_snlo_file(
+    file_name: str, file_path: str = "C:/SNLO/", rows: int = 100_000
+) -> Iterator[np.ndarray]:
+    """Read a file generated by SNLO in blocks of `rows` rows (the last one may be shorter)."""
+    with open(file_path + file_name, "rb") as f:
+        while True:
+            text = b"".join(itertools.islice(f, rows))
+            if not text.strip():
+                return
+            block = parse_snlo_text(text)
+            if block is None:
+                block = _import_snlo_lines(text.decode().splitlines())
+            yield block
+
+
+class ColumnStatistics:
+    """Statistics per column, which are updated block by block."""
+
+    __slots__ = ("count", "sum", "minimum", "maximum", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum: np.ndarray = np.zeros(0)
+        self.minimum: np.ndarray = np.zeros(0)
+        self.maximum: np.ndarray = np.zeros(0)
+        self.mean: np.ndarray = np.zeros(0)
+        self._m2: np.ndarray = np.zeros(0)  # sum of squared deviations from the mean
+
+    def update(self, block: np.ndarray) -> None:
+        """Add the rows of a 2D block."""
+        n = len(block)
+        if n == 0:
+            return
+        mean = block.mean(axis=0)
+        m2 = ((block - mean) ** 2).sum(axis=0)
+        if self.count == 0:
+            self.sum = block.sum(axis=0)
+            self.minimum = block.min(axis=0)
+            self.maximum = block.max(axis=0)
+            self.mean, self._m2 = mean, m2
+        else:
+            # combine the moments of both parts (Chan et al.)
+            total = self.count + n
+            delta = mean - self.mean
+            self._m2 = self._m2 + m2 + delta**2 * self.count * n / total
+            self.mean = self.mean + delta * n / total
+            self.sum = self.sum + block.sum(axis=0)
+            self.minimum = np.minimum(self.minimum, block.min(axis=0))
+            self.maximum = np.maximum(self.maximum, block.max(axis=0))
+        self.count += n
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Population variance per column."""
+        return self._m2 / self.count
+
+    @property
+    def std(self) -> np.ndarray:
+        """Population standard deviation per column."""
+        return np.sqrt(self.variance)
+
+
+def reduce_snlo_file(
+    file_name: str, file_path: str = "C:/SNLO/", rows: int = 100_000
+) -> ColumnStatistics:
+    """Calculate count, sum, minimum, maximum, mean, and variance of each column of a file."""
+    statistics = ColumnStatistics()
+    for block in iter_snlo_file(file_name, file_path, rows):
+        statistics.update(block)
+    return statistics
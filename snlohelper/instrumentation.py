@@ -0,0 +1,308 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Instrumentation
+===============
+
+Optional timing of the GUI primitives, the helper functions in `utils` and the phases of a
+function run (open, configure, accept, run, read, interpret...)::
+
+    from snlohelper import instrumentation
+
+    recorder = instrumentation.enable()
+    ...  # run your sweep
+    print(recorder.summary())
+    recorder.to_json("timing.json")
+    instrumentation.disable()
+
+The timings are grouped by the function class (scope), in which they happened.
+While disabled, the overhead is a single check per call.
+
+`python -m snlohelper.instrumentation` reports the import time of the modules and whether they
+load the GUI dependencies (pyautogui, pyperclip), see `import_times`.
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import functools
+import json
+import math
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+# upper edges of the histogram bins in seconds
+BIN_EDGES = (1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1, 10, math.inf)
+
+GLOBAL_SCOPE = "global"
+
+recorder: Optional["Recorder"] = None
+_scope: ContextVar[str] = ContextVar("scope", default=GLOBAL_SCOPE)
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+class Statistics:
+    """Count, wall times, and histogram of a single operation."""
+
+    __slots__ = ("count", "total", "min", "max", "histogram")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.histogram = [0] * len(BIN_EDGES)
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+        self.histogram[bisect_left(BIN_EDGES, duration)] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0,
+            "max": self.max,
+            "histogram": self.histogram,
+        }
+
+
+class Recorder:
+    """Collects the statistics of all operations, keyed by scope and operation name."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, dict[str, Statistics]] = {}
+
+    def record(self, scope: str, name: str, duration: float) -> None:
+        try:
+            statistics = self.data[scope][name]
+        except KeyError:
+            statistics = self.data.setdefault(scope, {}).setdefault(name, Statistics())
+        statistics.add(duration)
+
+    def reset(self) -> None:
+        self.data.clear()
+
+    def summary(self) -> str:
+        """Return a table of all operations, the most expensive ones per scope first."""
+        lines = [
+            f"{'scope':<16} {'operation':<28} {'count':>8} {'total s':>10} {'mean ms':>10}"
+            f" {'min ms':>10} {'max ms':>10}"
+        ]
+        for scope, operations in sorted(self.data.items()):
+            for name, s in sorted(operations.items(), key=lambda item: -item[1].total):
+                lines.append(
+                    f"{scope:<16} {name:<28} {s.count:>8} {s.total:>10.3f} {s.mean * 1e3:>10.3f}"
+                    f" {s.min * 1e3:>10.3f} {s.max * 1e3:>10.3f}"
+                )
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "bin_edges": [str(edge) for edge in BIN_EDGES],
+            "scopes": {
+                scope: {name: s.as_dict() for name, s in operations.items()}
+                for scope, operations in self.data.items()
+            },
+        }
+
+    def to_json(self, file_name: Optional[str] = None) -> str:
+        """Return the statistics as a JSON string and write them to `file_name`, if given."""
+        text = json.dumps(self.as_dict(), indent=2)
+        if file_name is not None:
+            with open(file_name, "w") as f:
+                f.write(text)
+        return text
+
+
+def enable(new_recorder: Optional[Recorder] = None) -> Recorder:
+    """Start recording (into `new_recorder` or a new one) and return the recorder.
+
+    The current GUI backend is wrapped in order to time the primitives.
+    """
+    global recorder
+    from . import utils
+
+    recorder = Recorder() if new_recorder is None else new_recorder
+    backend = utils.get_backend()
+    if not isinstance(backend, InstrumentedBackend):
+        utils.set_backend(InstrumentedBackend(backend))
+    return recorder
+
+
+def disable() -> Optional[Recorder]:
+    """Stop recording, unwrap the GUI backend, and return the recorder."""
+    global recorder
+    from . import utils
+
+    old, recorder = recorder, None
+    backend = utils.get_backend()
+    if isinstance(backend, InstrumentedBackend):
+        utils.set_backend(backend.backend)
+    return old
+
+
+@contextmanager
+def measure(name: str, scope: Optional[str] = None) -> Iterator[None]:
+    """Measure the wall time of the block as operation `name`.
+
+    If `scope` is given, it is used for this operation and all operations within the block.
+    """
+    if recorder is None:
+        yield
+        return
+    token = None if scope is None else _scope.set(scope)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        if token is not None:
+            _scope.reset(token)
+        if recorder is not None:
+            recorder.record(_scope.get() if scope is None else scope, name, duration)
+
+
+def timed(name: str) -> Callable[[Function], Function]:
+    """Decorate a function to measure its calls as operation `name`."""
+
+    def decorator(function: Function) -> Function:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if recorder is None:
+                return function(*args, **kwargs)
+            with measure(name):
+                return function(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def timed_phase(name: str) -> Callable[[Function], Function]:
+    """Decorate a method to measure its calls as phase `name` in the scope of its class."""
+
+    def decorator(method: Function) -> Function:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if recorder is None:
+                return method(self, *args, **kwargs)
+            with measure(name, scope=type(self).__name__):
+                return method(self, *args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+class InstrumentedBackend:
+    """Wraps a GUI backend and measures each primitive as "gui.<name>"."""
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+
+    def _call(self, name: str, *args):
+        with measure(f"gui.{name}"):
+            return getattr(self.backend, name)(*args)
+
+    def click(self, x: float, y: float) -> None:
+        self._call("click", x, y)
+
+    def double_click(self, x: Optional[float] = None, y: Optional[float] = None) -> None:
+        self._call("double_click", x, y)
+
+    def press(self, key: str) -> None:
+        self._call("press", key)
+
+    def hotkey(self, *keys: str) -> None:
+        self._call("hotkey", *keys)
+
+    def write(self, text: str) -> None:
+        self._call("write", text)
+
+    def paste(self) -> str:
+        return self._call("paste")
+
+    def size(self) -> tuple[int, int]:
+        return self.backend.size()
+
+    def position(self) -> tuple[float, float]:
+        return self.backend.position()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.backend, name)
+
+
+IMPORT_MODULES = (
+    "snlohelper.import_snlo_file",
+    "snlohelper.output_files",
+    "snlohelper.gaussian",
+    "snlohelper.snlo",
+    "snlohelper.main_window",
+)
+GUI_DEPENDENCIES = ("pyautogui", "pyperclip")
+
+
+def import_times(modules: Iterable[str] = IMPORT_MODULES) -> dict[str, tuple[float, bool]]:
+    """Measure the import time of each module in a fresh interpreter (`python -X importtime`).
+
+    :return: Import time in seconds and whether the GUI dependencies were imported, per module.
+    """
+    import subprocess
+    import sys
+
+    times: dict[str, tuple[float, bool]] = {}
+    for module in modules:
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total = 0
+        gui = False
+        for line in process.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            parts = line.split("|")
+            if len(parts) != 3 or not parts[1].strip().isdigit():
+                continue
+            name = parts[2].strip()
+            if name == module:
+                total = int(parts[1])
+            gui = gui or name.split(".")[0] in GUI_DEPENDENCIES
+        times[module] = total * 1e-6, gui
+    return times
+
+
+if __name__ == "__main__":  # pragma: nocover
+    for module, (duration, gui) in import_times().items():
+        print(f"{module:<30} {duration * 1e3:8.1f} ms{'  (loads GUI)' if gui else ''}")
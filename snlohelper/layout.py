@@ -0,0 +1,116 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Layout files
+============
+
+A layout file stores the screenfactors and the window offset for a screen, such that a moved SNLO
+window or another resolution does not require code changes. It is a JSON file like::
+
+    {"factors": [1.0, 1.0], "offset": [200, 100]}
+
+The default layout file of a screen resolution is loaded by `main_window.MainWindow`.
+
+If SNLO is moved, `locate_window` finds the offset via template matching on a screenshot.
+Capture the template once with `capture_template` while the window is at its original place.
+"""
+
+import json
+import os
+from typing import Optional
+
+from . import utils
+
+LAYOUT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".snlohelper")
+TEMPLATE_FILE = os.path.join(LAYOUT_DIRECTORY, "template.png")
+# Position (in FHD standard) of the top left corner of the template: the function menu.
+TEMPLATE_REFERENCE: utils.Point = (0, 30)
+TEMPLATE_SIZE: utils.Point = (130, 120)
+
+
+def default_layout_file() -> str:
+    """Get the name of the layout file for the current screen resolution."""
+    width, height = utils.get_backend().size()
+    return os.path.join(LAYOUT_DIRECTORY, f"layout_{width}x{height}.json")
+
+
+def load_layout(file_name: Optional[str] = None) -> None:
+    """Apply the factors (if given) and the window offset of a layout file."""
+    with open(default_layout_file() if file_name is None else file_name, "r") as f:
+        layout = json.load(f)
+    if "factors" in layout:
+        utils.set_screenfactors(tuple(layout["factors"]))  # type: ignore
+    utils.set_window_offset(tuple(layout.get("offset", (0, 0))))  # type: ignore
+
+
+def save_layout(file_name: Optional[str] = None) -> str:
+    """Save the current factors and window offset as a layout file and return its name."""
+    file_name = default_layout_file() if file_name is None else file_name
+    os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+    layout = {"offset": list(utils.get_window_offset())}
+    factors = utils.get_screenfactors()
+    if factors is not None:
+        layout["factors"] = list(factors)
+    with open(file_name, "w") as f:
+        json.dump(layout, f)
+    return file_name
+
+
+def capture_template(
+    file_name: str = TEMPLATE_FILE,
+    reference: utils.Point = TEMPLATE_REFERENCE,
+    size: utils.Point = TEMPLATE_SIZE,
+) -> None:
+    """Store a screenshot of the region at `reference` (standard coordinates) as template.
+
+    The SNLO window has to be at the place given by the current window offset.
+    """
+    import pyautogui
+
+    x, y = utils.scale(*reference)
+    factors = utils.get_screenfactors() or (1, 1)
+    width, height = round(size[0] / factors[0]), round(size[1] / factors[1])
+    os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+    pyautogui.screenshot(region=(round(x), round(y), width, height)).save(file_name)
+
+
+def locate_window(
+    file_name: str = TEMPLATE_FILE,
+    reference: utils.Point = TEMPLATE_REFERENCE,
+    confidence: Optional[float] = None,
+) -> utils.Point:
+    """Find the template on the screen, set the window offset accordingly, and return it.
+
+    :param confidence: Required match (0-1), needs opencv. By default an exact match is required.
+    """
+    import pyautogui
+
+    kwargs = {} if confidence is None else {"confidence": confidence}
+    box = pyautogui.locateOnScreen(file_name, **kwargs)
+    if box is None:
+        raise ValueError("The SNLO window could not be found on the screen.")
+    utils.set_window_offset((0, 0))
+    x, y = utils.scale(*reference)
+    offset = box.left - x, box.top - y
+    utils.set_window_offset(offset)
+    return offset
@@ -24,10 +24,12 @@
 The SNLO main window
 """
 
-from typing import Optional, TypeVar
+import os
+from typing import Iterator, Optional, TypeVar
 
-from .utils import gui, scale, get_screenfactors, set_screenfactors, Point
-from .functions import Functions, open_function
+from .utils import click, compile_layout, get_screenfactors, set_screenfactors, Point
+from .functions import Functions, open_function, _functions_coord
+from .layout import default_layout_file, load_layout
 from .base_function import BaseFunction
 from .ref_index import RefractiveIndex
 from .focus import Focus
@@ -51,17 +53,41 @@ function_classes = {
 FunctionClass = TypeVar("FunctionClass")
 
 
+def collect_positions() -> Iterator[Point]:
+    """Yield all positions of the main window and the supported functions."""
+    yield MainWindow._close_pos
+    yield from _functions_coord.values()
+    for function_class in function_classes.values():
+        function = function_class()
+        for name in ("_run_pos", "_result_pos", "_close_pos", "_accept_pos", "_change_inputs_pos"):
+            if hasattr(function, name):
+                yield getattr(function, name)
+        for positions in function._configuration_pos.values():
+            yield from positions
+
+
 class MainWindow:
     _close_pos = (95, 14)
 
-    def __init__(self, screenfactors: Optional[Point] = None, **kwargs) -> None:
+    def __init__(
+        self, screenfactors: Optional[Point] = None, layout_file: Optional[str] = None, **kwargs
+    ) -> None:
+        """Set up the screen layout.
+
+        :param screenfactors: Scaling factors from FHD to the screen, detected if not given.
+        :param layout_file: Layout file with window offset and factors, see `layout`. By default,
+            the layout file of the screen resolution is loaded, if it exists.
+        """
         super().__init__(**kwargs)
+        if layout_file is not None or os.path.isfile(default_layout_file()):
+            load_layout(layout_file)
         sf = get_screenfactors()
         if sf is None or screenfactors is not None:
             set_screenfactors(new_factors=screenfactors)
+        compile_layout(collect_positions())
 
     def close(self) -> None:
-        gui.click(*scale(self._close_pos))
+        click(self._close_pos)
 
     def open_function(self, key: str | Functions) -> Optional[BaseFunction]:
         open_function(key)
@@ -22,7 +22,8 @@
 
 from typing import Any, Optional, Protocol
 
-from .utils import Point, gui, scale
+from .instrumentation import timed_phase
+from .utils import Point, click
 from .base_function import BaseFunction
 
 
@@ -35,18 +36,31 @@ class MixMethods(BaseFunction, Protocol):
     _accept_pos: Point
     _change_inputs_pos: Point
 
+    @timed_phase("accept")
     def accept(self) -> None:
         """Click 'Accept'."""
-        gui.click(*scale(*self._accept_pos))
+        click(self._accept_pos)
 
+    @timed_phase("change_inputs")
     def change_inputs(self) -> None:
         """Click 'Change Inputs'."""
-        gui.click(*scale(*self._change_inputs_pos))
+        click(self._change_inputs_pos)
 
     def configure_run_read(
-        self, data: Optional[dict[str, Any]] = None, **kwargs
+        self, data: Optional[dict[str, Any]] = None, force: bool = True, **kwargs
     ) -> dict[str, float | list[float]]:
-        """Configure and run an analysis and return the result."""
-        self.configure(data)
+        """Configure and run an analysis and return the result, see `BaseFunction`."""
+        self.configure(data, force=force)
         self.accept()
         return self.run_and_read(**kwargs)
+
+    def start(self, data: Optional[dict[str, Any]] = None) -> list[str]:
+        """Configure and run an analysis without waiting for it.
+
+        :return: The result rows before the run, see `wait_for_results`.
+        """
+        self.configure(data)
+        self.accept()
+        previous = self._previous_results()
+        self.run()
+        return previous
@@ -0,0 +1,165 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Optimisation
+============
+
+Optimise an output of a function with a bounded Nelder-Mead search and a hard budget of runs::
+
+    mix = MainWindow().open_two_d_mix_lp()
+    best, value, objective = optimize(
+        mix,
+        {("Beam diam. (fwhm mm)", 0): (0.05, 1), ("Rad. curv. (mm/air)", 0): (100, 1000)},
+        output=("Output pulse energy (mJ)", 2),
+        budget=30,
+    )
+
+Pass the returned objective to a later call in order to reuse its evaluations.
+"""
+
+import logging
+from typing import Any, Optional, TYPE_CHECKING, Union
+
+from .adaptive import Objective, Output
+from .sweep import Field
+
+if TYPE_CHECKING:
+    from .base_function import BaseFunction
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+# Iterations in a row without a new evaluation, after which the search stops.
+MAX_STALE_ITERATIONS = 20
+
+
+class BudgetExhausted(Exception):
+    """The number of allowed runs is used up."""
+
+
+def optimize(
+    function: "BaseFunction",
+    bounds: dict[Union[str, Field], tuple[float, float]],
+    output: Output,
+    maximize: bool = True,
+    budget: int = 30,
+    start: Optional[list[float]] = None,
+    initial_step: float = 0.25,
+    tolerance: float = 1e-3,
+    resolution: float = 1e-4,
+    objective: Optional[Objective] = None,
+    **kwargs,
+) -> tuple[dict[Field, float], float, Objective]:
+    """Find the field values within `bounds` which maximise (or minimise) `output`.
+
+    A Nelder-Mead simplex search in coordinates normalised to the bounds. Points are rounded to
+    `resolution` (relative to the bounds) and no point is run twice. The search stops as well, if
+    several iterations in a row only revisit evaluated points (e.g. `tolerance < resolution`).
+
+    :param budget: Maximum number of new runs, the search stops when it is reached.
+    :param start: Start values, by default the best evaluation of `objective` or the centre.
+    :param initial_step: Size of the initial simplex relative to the bounds.
+    :param tolerance: Stop when the simplex is smaller than this (relative to the bounds).
+    :param objective: An objective of an earlier search with the same fields and output.
+    :return: Best values per field, the best output value, and the objective.
+    """
+    if budget < 1:
+        raise ValueError(f"The budget has to be at least one run, not {budget}.")
+    fields = list(bounds)
+    if objective is None:
+        objective = Objective(function, fields, output, **kwargs)
+    limits = list(bounds.values())
+    dimension = len(limits)
+    sign = -1 if maximize else 1
+    max_runs = objective.runs + budget
+
+    def to_values(u: list[float]) -> list[float]:
+        return [low + (high - low) * x for x, (low, high) in zip(u, limits)]
+
+    def to_unit(values: tuple[float, ...]) -> list[float]:
+        return [(v - low) / (high - low) for v, (low, high) in zip(values, limits)]
+
+    def cost(u: list[float]) -> tuple[float, list[float]]:
+        u = [round(min(max(x, 0), 1) / resolution) * resolution for x in u]
+        point = tuple(float(v) for v in to_values(u))
+        if point not in objective.evaluations and objective.runs >= max_runs:
+            raise BudgetExhausted
+        return sign * objective(*point), u
+
+    if start is not None:
+        u0 = to_unit(tuple(start))
+    elif objective.evaluations:
+        best_point = min(objective.evaluations, key=lambda p: sign * objective.evaluations[p][0])
+        u0 = to_unit(best_point)
+    else:
+        u0 = [0.5] * dimension
+
+    simplex: list[tuple[float, list[float]]] = []
+    try:
+        simplex.append(cost(u0))
+        for i in range(dimension):
+            u = list(u0)
+            u[i] = u[i] + initial_step if u[i] + initial_step <= 1 else u[i] - initial_step
+            simplex.append(cost(u))
+        stale_iterations = 0
+        while True:
+            runs = objective.runs
+            simplex.sort(key=lambda s: s[0])
+            size = max(abs(a - b) for _, u in simplex[1:] for a, b in zip(u, simplex[0][1]))
+            if size < tolerance:
+                break
+            worst_cost, worst = simplex[-1]
+            centroid = [sum(u[i] for _, u in simplex[:-1]) / dimension for i in range(dimension)]
+            reflected = cost([c + (c - w) for c, w in zip(centroid, worst)])
+            if reflected[0] < simplex[0][0]:
+                expanded = cost([c + 2 * (c - w) for c, w in zip(centroid, worst)])
+                simplex[-1] = expanded if expanded[0] < reflected[0] else reflected
+            elif reflected[0] < simplex[-2][0]:
+                simplex[-1] = reflected
+            else:
+                contracted = cost([c + 0.5 * (w - c) for c, w in zip(centroid, worst)])
+                if contracted[0] < worst_cost:
+                    simplex[-1] = contracted
+                else:
+                    best = simplex[0][1]
+                    simplex = [simplex[0]] + [
+                        cost([b + 0.5 * (x - b) for b, x in zip(best, u)]) for _, u in simplex[1:]
+                    ]
+            stale_iterations = stale_iterations + 1 if objective.runs == runs else 0
+            if stale_iterations > MAX_STALE_ITERATIONS:
+                log.info("The search does not reach new points anymore.")
+                break
+    except BudgetExhausted:
+        log.info(f"Budget of {budget} runs exhausted.")
+
+    best_point = min(objective.evaluations, key=lambda p: sign * objective.evaluations[p][0])
+    values: dict[Field, float] = dict(zip(objective.fields, best_point))
+    return values, objective.evaluations[best_point][0], objective
+
+
+def best_result(objective: Objective, maximize: bool = True) -> dict[str, Any]:
+    """Return the result of the best evaluation of an objective."""
+    sign = -1 if maximize else 1
+    point = min(objective.evaluations, key=lambda p: sign * objective.evaluations[p][0])
+    return objective.evaluations[point][1]
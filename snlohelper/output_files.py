@@ -0,0 +1,125 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Output files
+============
+
+Schemas of the files SNLO writes, such that their columns are accessible by name::
+
+    output = load_output_set(Functions.TWOD_MIX_LP)
+    beam = output["ID_BEAM.dat"]
+    plt.plot(beam["time"], beam["power"])
+
+The arrays are structured views of the parsed data, no values are copied.
+Register further files with `register_schema` and `output_sets`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Union
+
+import numpy as np
+
+from .functions import Functions
+from .import_snlo_file import import_snlo_file
+
+
+class FileSchema:
+    """Names of the columns of an SNLO output file (all float64)."""
+
+    def __init__(self, file_name: str, columns: list[str], description: str = "") -> None:
+        self.file_name = file_name
+        self.columns = columns
+        self.description = description
+        self.dtype = np.dtype([(name, np.float64) for name in columns])
+
+    def structured(self, data: np.ndarray) -> np.ndarray:
+        """Return a structured view (one record per row) of a parsed 2D array."""
+        if data.ndim != 2 or data.shape[1] != len(self.columns):
+            raise ValueError(
+                f"'{self.file_name}' should have {len(self.columns)} columns, "
+                f"but the data has the shape {data.shape}."
+            )
+        return np.ascontiguousarray(data, dtype=np.float64).view(self.dtype)[:, 0]
+
+    def column_views(self, data: np.ndarray) -> dict[str, np.ndarray]:
+        """Return a view of each column of a parsed 2D array by name."""
+        return {name: data[:, i] for i, name in enumerate(self.columns)}
+
+
+_beam_columns = [
+    "time",  # s
+    "power",  # W
+    "phase",  # rad
+    "mx2",  # Mx^2
+    "my2",  # My^2
+    "radius_x",  # radius of curvature in x
+    "radius_y",  # radius of curvature in y
+    "x_tilt",
+    "wx2",  # w_x^2
+    "wy2",  # w_y^2
+]
+
+schemas: dict[str, FileSchema] = {}
+
+
+def register_schema(schema: FileSchema) -> None:
+    schemas[schema.file_name] = schema
+
+
+for schema in (
+    FileSchema("OPA2D_SP.dat", ["detuning", "red1", "red2", "blue"], "Spectra, detuning in MHz"),
+    FileSchema("ID_BEAM.dat", _beam_columns, "Idler (Red1) beam versus time"),
+    FileSchema("SIG_BEAM.dat", _beam_columns, "Signal (Red2) beam versus time"),
+    FileSchema("PMP_BEAM.dat", _beam_columns, "Pump (Blue) beam versus time"),
+):
+    register_schema(schema)
+
+# Files written by a function (after its 'Spectra' button for 2D-mix-LP)
+output_sets: dict[Functions, list[str]] = {
+    Functions.TWOD_MIX_LP: ["OPA2D_SP.dat", "ID_BEAM.dat", "SIG_BEAM.dat", "PMP_BEAM.dat"],
+}
+
+
+def load_output_file(file_name: str, file_path: str = "C:/SNLO/", **kwargs) -> np.ndarray:
+    """Load a file with a registered schema as structured array.
+
+    :param kwargs: Passed to `import_snlo_file`, e.g. `cache`.
+    """
+    return schemas[file_name].structured(import_snlo_file(file_name, file_path, **kwargs))
+
+
+def load_output_set(
+    function: Union[str, Functions],
+    file_path: str = "C:/SNLO/",
+    max_workers: Optional[int] = None,
+    **kwargs,
+) -> dict[str, np.ndarray]:
+    """Load all output files of a function in parallel threads as structured arrays.
+
+    :param kwargs: Passed to `import_snlo_file`, e.g. `cache`.
+    :return: The structured arrays by file name.
+    """
+    file_names = output_sets[Functions(function)]
+    with ThreadPoolExecutor(max_workers=max_workers or len(file_names)) as executor:
+        arrays = executor.map(lambda name: load_output_file(name, file_path, **kwargs), file_names)
+        return dict(zip(file_names, arrays))
@@ -0,0 +1,141 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Parsed file cache
+=================
+
+Binary `.npy` copies of parsed SNLO output files, such that importing the same file again is
+nearly instant::
+
+    data = import_snlo_file("ID_BEAM.dat", cache=True)
+
+A cache entry is keyed by the absolute path, size, and modification time of the text file.
+Entries of a modified file are deleted, and the least recently used entries are deleted, if the
+total size exceeds the limit. Cached arrays are memory mapped and read only.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Callable
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".snlohelper", "parsed")
+
+
+class ParsedFileCache:
+    """Cache of parsed files as `.npy` files in a directory.
+
+    :param directory: Directory of the cache files.
+    :param max_size: Maximum total size of the cache files in bytes.
+    """
+
+    def __init__(self, directory: str = CACHE_DIRECTORY, max_size: int = 1_000_000_000) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def _prefix(self, path: str) -> str:
+        return hashlib.sha256(path.encode()).hexdigest()[:32]
+
+    def load(self, file_name: str, parse: Callable[[str], np.ndarray]) -> np.ndarray:
+        """Return the cached array of a file or parse the file with `parse` and cache it."""
+        path = os.path.abspath(file_name)
+        stat = os.stat(path)
+        prefix = self._prefix(path)
+        name = os.path.join(self.directory, f"{prefix}_{stat.st_size}_{stat.st_mtime_ns}.npy")
+        try:
+            data = np.load(name, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            pass
+        else:
+            os.utime(name)  # mark as recently used
+            return data
+        self._remove_stale(prefix)
+        data = parse(path)
+        self._store(name, data)
+        data.flags.writeable = False  # like a cached array
+        return data
+
+    def _remove_stale(self, prefix: str) -> None:
+        """Remove the entries of older versions of a file."""
+        try:
+            entries = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.startswith(prefix + "_"):
+                self._remove(os.path.join(self.directory, entry))
+
+    def _store(self, name: str, data: np.ndarray) -> None:
+        if data.dtype == object:
+            return  # ragged data cannot be memory mapped
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = f"{name}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, data)
+        os.replace(temporary, name)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the total size is within the limit."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError as exc:  # e.g. still memory mapped on Windows
+            log.debug(f"Could not remove cache file '{path}': {exc}")
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        try:
+            entries = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.endswith(".npy"):
+                self._remove(os.path.join(self.directory, entry))
+
+
+def get_default_cache() -> ParsedFileCache:
+    """Get the cache in the default directory, creating it if necessary."""
+    global default_cache
+    try:
+        return default_cache
+    except NameError:
+        default_cache = ParsedFileCache()
+        return default_cache
@@ -0,0 +1,154 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Pipelined runs
+==============
+
+Drive several SNLO instances, whose windows are placed side by side at known window offsets.
+While one instance computes, the next one is configured and started::
+
+    scheduler = PipelineScheduler(TwoDMixLP, offsets=[(0, 0), (960, 0)])
+    configurations = [{"Energy/power (J or W)": [None, energy, None]} for energy in energies]
+    for result in scheduler.map(configurations):
+        print(result["Output pulse energy (mJ)"])
+
+The results are yielded in the order of the configurations. This pays off for functions with long
+computations, for example 2D-mix-SP or 2D-cav-LP, where the GUI is idle most of the time.
+The windows must not overlap, as every click brings a window to the front.
+"""
+
+from collections import deque
+import logging
+import time
+from typing import Any, Iterable, Iterator, Optional, TYPE_CHECKING
+
+from . import utils
+from .base_function import ResultWatcher
+from .instrumentation import measure
+
+if TYPE_CHECKING:
+    from .base_function import BaseFunction
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+
+class Instance:
+    """One SNLO instance with its window offset and the function object controlling it."""
+
+    def __init__(self, offset: utils.Point, function: "BaseFunction") -> None:
+        self.offset = offset
+        self.function = function
+        self.job: Optional[int] = None  # index of the running configuration
+        self.watcher = ResultWatcher([])
+        self.next_check = 0.0
+
+    def activate(self) -> None:
+        """Make the positions refer to this instance."""
+        utils.set_window_offset(self.offset)
+
+
+class PipelineScheduler:
+    """Run configurations of a function on several SNLO instances at the same time.
+
+    :param function_class: Function class, for example `TwoDMixLP`. Each instance gets its own
+        object (and shadow state).
+    :param offsets: Window offsets (screen pixels) of the SNLO instances.
+    :param waiting_time, max_tries, interval, waiting_line_count: As in `run_and_read`.
+    :param timeout: Seconds until a job without a new result raises a TimeoutError (when its
+        result is due). By default as in `run_and_read`, at least the function's `_run_timeout`.
+    :param first_interval: First interval of reading the result, see `wait_for_results`.
+    """
+
+    def __init__(
+        self,
+        function_class: type["BaseFunction"],
+        offsets: list[utils.Point],
+        waiting_time: float = 1,
+        max_tries: int = 10,
+        interval: float = 0.5,
+        waiting_line_count: int = 3,
+        first_interval: float = 0.01,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.instances = [Instance(offset, function_class()) for offset in offsets]
+        if timeout is None:
+            timeout = max(waiting_time + max_tries * interval, function_class._run_timeout)
+        self.timeout = timeout
+        self.max_interval = interval
+        self.waiting_line_count = waiting_line_count
+        self.first_interval = first_interval
+
+    def _start(self, instance: Instance, index: int, data: Optional[dict[str, Any]]) -> None:
+        instance.activate()
+        previous = instance.function.start(data)
+        instance.job = index
+        instance.watcher = instance.function._watcher(
+            previous, self.timeout, self.max_interval, self.waiting_line_count, self.first_interval
+        )
+        instance.next_check = time.perf_counter() + instance.watcher.delay
+
+    def _check(self, instance: Instance) -> Optional[list[str]]:
+        """Read the result of an instance and return it, if it is finished."""
+        instance.activate()
+        if instance.function._update_watcher(instance.watcher, instance.function.read_results()):
+            return instance.watcher.rows
+        instance.next_check = time.perf_counter() + instance.watcher.delay
+        return None
+
+    def map(self, configurations: Iterable[Optional[dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+        """Run each configuration and yield the results in the order of the configurations.
+
+        An exception of interpreting a result (for example, no phase match) is raised, when that
+        result is due. The window offset is restored afterwards.
+        """
+        offset = utils.get_window_offset()
+        try:
+            jobs = deque(enumerate(configurations))
+            finished: dict[int, Any] = {}
+            next_index = 0
+            while jobs or any(instance.job is not None for instance in self.instances):
+                for instance in self.instances:
+                    if instance.job is None and jobs:
+                        self._start(instance, *jobs.popleft())
+                busy = [instance for instance in self.instances if instance.job is not None]
+                instance = min(busy, key=lambda i: i.next_check)
+                with measure("wait", scope=type(self).__name__):
+                    time.sleep(max(instance.next_check - time.perf_counter(), 0))
+                try:
+                    rows = self._check(instance)
+                    if rows is not None:
+                        with measure("interpret", scope=type(instance.function).__name__):
+                            finished[instance.job] = instance.function.interpret_results(rows)
+                        instance.job = None
+                except Exception as exc:
+                    finished[instance.job] = exc
+                    instance.job = None
+                while next_index in finished:
+                    result = finished.pop(next_index)
+                    next_index += 1
+                    if isinstance(result, Exception):
+                        raise result
+                    yield result
+        finally:
+            utils.set_window_offset(offset)
@@ -21,9 +21,9 @@
 # SOFTWARE.
 
 from typing import Any
-from collections import defaultdict
 
 from .base_function import BaseFunction, Functions
+from .result_schema import LabeledSchema
 
 
 class PW_OPO_BB(BaseFunction):
@@ -56,26 +56,7 @@ class PW_OPO_BB(BaseFunction):
         "# of z integration steps": [(351, 555)],
         "New noise (1/0)": [(351, 571)]
     }
-
-    def interpret_results(self, rows: list[str]) -> dict[str, Any]:
-        """Interpret the results and return them as a dictionary."""
-        data = defaultdict(list) # to support duplicate rows e.g., in qmix for different phase-matching conditions
-        for row in rows:
-            # skip empty lines
-            if not row:
-                continue
-            if row == 'ERROR: No phase match found.':
-                raise Exception('No phase match found')
-            text, values = row.split("=")
-            content = []
-            for element in values.split():
-                try:
-                    val = float(element)
-                except ValueError:
-                    val = element
-                content.append(val)
-            data[text.strip()].append(content)
-        return data
+    _result_schema = LabeledSchema(multiple=True)
 
     def run_and_read(
         self,
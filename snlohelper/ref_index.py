@@ -20,10 +20,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Any
+from typing import Any, Optional, TYPE_CHECKING
 
 from .base_function import BaseFunction, Functions
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class RefractiveIndex(BaseFunction):
     _function = Functions.REF_INDEX
@@ -65,3 +68,133 @@ class RefractiveIndex(BaseFunction):
         }
         results = self.configure_run_read(kwargs)
         return results["Refractive index (o,e)"]
+
+    def refractive_indices_array(
+        self,
+        wavelengths: Any,
+        temperatures: Any = None,
+        Crystal=None,
+        theta=None,
+        phi=None,
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        """Get the refractive indices (o, e) for arrays of wavelengths and temperatures.
+
+        The window is opened and crystal, theta, and phi are set once. Afterwards only the
+        wavelength and temperature fields are changed, if their value changes.
+        `wavelengths` and `temperatures` are broadcast against each other, the last axis changes
+        fastest. If `temperatures` is None, the current temperature is used.
+
+        :return: Arrays of n_o and n_e with the broadcast shape.
+        """
+        import numpy as np
+
+        wl, temp = np.broadcast_arrays(
+            np.asarray(wavelengths, dtype=float),
+            np.asarray(np.nan if temperatures is None else temperatures, dtype=float),
+        )
+        self.configure({"Crystal": Crystal, "theta": theta, "phi": phi})
+        n = np.empty(wl.shape + (2,))
+        for index in np.ndindex(wl.shape):
+            data: dict[str, Any] = {"Wavelength": float(wl[index])}
+            if temperatures is not None:
+                data["Temperature"] = float(temp[index])
+            self._configure(data, force=False)
+            n[index] = self.run_and_read()["Refractive index (o,e)"]
+        return n[..., 0], n[..., 1]
+
+
+class RefractiveIndexTable:
+    """Dense table of refractive indices, interpolated with cubic splines (requires scipy).
+
+    Sample it once with `sample`, store it with `save`, and query it without SNLO::
+
+        table = RefractiveIndexTable.sample(ri, np.linspace(300, 1300, 51), Crystal="ABB")
+        n_o, n_e = table(1064)
+
+    :param wavelengths: Sampled wavelengths in nm (ascending).
+    :param temperatures: Sampled temperatures (ascending) or None, if only one temperature.
+    :param n_o, n_e: Sampled indices, shape (temperatures, wavelengths) or (wavelengths,).
+    """
+
+    def __init__(
+        self,
+        wavelengths: "np.ndarray",
+        temperatures: Optional["np.ndarray"],
+        n_o: "np.ndarray",
+        n_e: "np.ndarray",
+    ) -> None:
+        import numpy as np
+        from scipy.interpolate import CubicSpline, RectBivariateSpline
+
+        self.wavelengths = np.asarray(wavelengths, dtype=float)
+        self.temperatures = None if temperatures is None else np.asarray(temperatures, float)
+        self.n_o = np.asarray(n_o, dtype=float)
+        self.n_e = np.asarray(n_e, dtype=float)
+        if self.temperatures is None:
+            self._splines = [CubicSpline(self.wavelengths, n) for n in (self.n_o, self.n_e)]
+        else:
+            kx = min(3, len(self.temperatures) - 1)
+            ky = min(3, len(self.wavelengths) - 1)
+            self._splines = [
+                RectBivariateSpline(self.temperatures, self.wavelengths, n, kx=kx, ky=ky)
+                for n in (self.n_o, self.n_e)
+            ]
+
+    @classmethod
+    def sample(
+        cls,
+        function: RefractiveIndex,
+        wavelengths: Any,
+        temperatures: Any = None,
+        Crystal=None,
+        theta=None,
+        phi=None,
+    ) -> "RefractiveIndexTable":
+        """Sample a grid of wavelengths (and temperatures) with SNLO."""
+        import numpy as np
+
+        wavelengths = np.sort(np.asarray(wavelengths, dtype=float))
+        if temperatures is None:
+            grid_wl, grid_temp = wavelengths, None
+        else:
+            temperatures = np.sort(np.asarray(temperatures, dtype=float))
+            grid_wl, grid_temp = np.meshgrid(wavelengths, temperatures)
+        n_o, n_e = function.refractive_indices_array(
+            grid_wl, grid_temp, Crystal=Crystal, theta=theta, phi=phi
+        )
+        return cls(wavelengths, temperatures, n_o, n_e)
+
+    def __call__(
+        self, wavelengths: Any, temperatures: Any = None
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        """Interpolate the indices (o, e) at the given wavelengths (and temperatures)."""
+        import numpy as np
+
+        if self.temperatures is None:
+            return tuple(spline(np.asarray(wavelengths, float)) for spline in self._splines)
+        if temperatures is None:
+            raise ValueError("The table depends on the temperature, specify it.")
+        wl, temp = np.broadcast_arrays(
+            np.asarray(wavelengths, dtype=float), np.asarray(temperatures, dtype=float)
+        )
+        return tuple(spline.ev(temp, wl) for spline in self._splines)  # type: ignore
+
+    def save(self, file_name: str) -> None:
+        import numpy as np
+
+        arrays = {"wavelengths": self.wavelengths, "n_o": self.n_o, "n_e": self.n_e}
+        if self.temperatures is not None:
+            arrays["temperatures"] = self.temperatures
+        np.savez(file_name, **arrays)
+
+    @classmethod
+    def load(cls, file_name: str) -> "RefractiveIndexTable":
+        import numpy as np
+
+        with np.load(file_name) as data:
+            return cls(
+                data["wavelengths"],
+                data["temperatures"] if "temperatures" in data else None,
+                data["n_o"],
+                data["n_e"],
+            )
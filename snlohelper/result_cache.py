@@ -0,0 +1,230 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Result cache
+============
+
+A persistent (SQLite) cache of interpreted results, keyed by the function and its complete
+configuration::
+
+    cache = ResultCache(snlo_version="78")
+    mix = MainWindow().open_two_d_mix_lp()
+    result = cache.configure_run_read(mix, {"Energy/power (J or W)": (None, 1e-3, None)})
+
+The complete configuration is taken from the shadow state of the function object. Missing fields
+are read once from SNLO. Do not change values in SNLO by hand without calling `resync` on the
+function object.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+from .base_function import BaseFunction, iterate_fields
+
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".snlohelper", "results.sqlite")
+
+
+def canonical_value(value: Any) -> str:
+    """Return a canonical text of a field value, such that e.g. "1E-3" equals 0.001."""
+    text = str(value).strip()
+    try:
+        return repr(float(text))
+    except ValueError:
+        return " ".join(text.split())
+
+
+def configuration_key(function_name: str, configuration: dict[tuple[str, int], Any]) -> str:
+    """Return the hash of a function name and its complete configuration."""
+    items = sorted((key, i, canonical_value(value)) for (key, i), value in configuration.items())
+    text = json.dumps([function_name, items])
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def effective_configuration(
+    function: BaseFunction, data: Optional[dict[str, Any]] = None
+) -> dict[tuple[str, int], Any]:
+    """Return the complete configuration after applying `data` (without changing SNLO).
+
+    Fields missing in the shadow state are read from SNLO first.
+    """
+    shadow = function._get_shadow()
+    fields = [
+        (key, i)
+        for key, positions in function._configuration_pos.items()
+        for i in range(len(positions))
+    ]
+    if any(field not in shadow for field in fields):
+        function.resync()
+    configuration: dict[tuple[str, int], Any] = {field: shadow[field] for field in fields}
+    if data is not None:
+        configuration.update({(key, i): value for key, i, value in iterate_fields(data)})
+    return configuration
+
+
+class ResultCache:
+    """Persistent cache of results.
+
+    :param file_name: SQLite database file.
+    :param max_size: Maximum size of the stored results in bytes. The least recently used results
+        are evicted.
+    :param memory_size: Maximum number of results kept in memory in addition.
+    :param snlo_version: Version of SNLO. If it differs from the stored one, the cache is cleared.
+    """
+
+    def __init__(
+        self,
+        file_name: str = CACHE_FILE,
+        max_size: int = 100_000_000,
+        memory_size: int = 1000,
+        snlo_version: Optional[str] = None,
+    ) -> None:
+        if file_name != ":memory:":
+            os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+        self.max_size = max_size
+        self.memory_size = memory_size
+        # recently used results, least recently used first
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._accessed: dict[str, float] = {}  # last access of memory hits, not yet stored
+        self.connection = sqlite3.connect(file_name)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY, result TEXT, size INTEGER, last_access REAL);
+            CREATE INDEX IF NOT EXISTS access ON results (last_access);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+            """
+        )
+        if snlo_version is not None:
+            self._check_version(snlo_version)
+
+    def _check_version(self, snlo_version: str) -> None:
+        row = self.connection.execute("SELECT value FROM meta WHERE name='snlo_version'").fetchone()
+        if row is None or row[0] != snlo_version:
+            self._memory.clear()
+            with self.connection:
+                self.connection.execute("DELETE FROM results")
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('snlo_version', ?)", (snlo_version,)
+                )
+
+    def close(self) -> None:
+        self._store_access()
+        self.connection.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self._accessed.clear()
+        with self.connection:
+            self.connection.execute("DELETE FROM results")
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return the result stored under `key` or None."""
+        try:
+            text = self._memory[key]
+        except KeyError:
+            pass
+        else:
+            self._memory.move_to_end(key)
+            self._accessed[key] = time.time()
+            return json.loads(text)
+        row = self.connection.execute("SELECT result FROM results WHERE key=?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute(
+                "UPDATE results SET last_access=? WHERE key=?", (time.time(), key)
+            )
+        self._remember(key, row[0])
+        return json.loads(row[0])
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        """Store a result and evict old ones, if the maximum size is exceeded."""
+        text = json.dumps(result)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, text, len(text), time.time()),
+            )
+        self._remember(key, text)
+        self._evict()
+
+    def _remember(self, key: str, text: str) -> None:
+        """Keep the result in memory, forgetting the least recently used ones."""
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _store_access(self) -> None:
+        """Store the last access of memory hits, such that eviction takes them into account."""
+        if self._accessed:
+            with self.connection:
+                self.connection.executemany(
+                    "UPDATE results SET last_access=? WHERE key=?",
+                    [(access, key) for key, access in self._accessed.items()],
+                )
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        self._store_access()
+        total = self.connection.execute("SELECT TOTAL(size) FROM results").fetchone()[0]
+        if total <= self.max_size:
+            return
+        rows = self.connection.execute(
+            "SELECT key, size FROM results ORDER BY last_access"
+        ).fetchall()
+        evict = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            evict.append((key,))
+            total -= size
+        with self.connection:
+            self.connection.executemany("DELETE FROM results WHERE key=?", evict)
+        for (key,) in evict:
+            self._memory.pop(key, None)
+
+    def effective_configuration(
+        self, function: BaseFunction, data: Optional[dict[str, Any]] = None
+    ) -> dict[tuple[str, int], Any]:
+        """Return the complete configuration after applying `data` (without changing SNLO)."""
+        return effective_configuration(function, data)
+
+    def configure_run_read(
+        self, function: BaseFunction, data: Optional[dict[str, Any]] = None, **kwargs
+    ) -> dict[str, Any]:
+        """Return the cached result or configure, run, and read the function (and cache it)."""
+        key = configuration_key(function._function, self.effective_configuration(function, data))
+        result = self.get(key)
+        if result is None:
+            result = function.configure_run_read(data, **kwargs)
+            self.put(key, result)
+        return result
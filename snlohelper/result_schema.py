@@ -0,0 +1,167 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Result schemas
+==============
+
+Each function class declares, how the text of its result field is parsed (`_result_schema`).
+`LabeledSchema` parses rows like "label = 1.0 2.0", `PositionalSchema` reads a fixed sequence of
+rows.
+
+Positional schemas have a fixed shape and can store results compactly as numpy record rows, for
+example for large sweeps::
+
+    schema = TwoDMixLP._result_schema
+    records = schema.to_records(results)  # structured array, one row per result
+    records["Output pulse energy (mJ)"][:, 2]
+
+If SNLO does not find a phase match, `PhaseMatchError` is raised.
+"""
+
+import re
+from typing import Any, Iterable, Optional
+
+PHASE_MATCH_ERROR = "ERROR: No phase match found."
+
+
+class PhaseMatchError(Exception):
+    """SNLO did not find a phase match."""
+
+    def __init__(self, message: str = "No phase match found") -> None:
+        super().__init__(message)
+
+
+_number = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def _convert(values: str) -> list[Any]:
+    """Convert the tokens to float, if they are numbers."""
+    elements = values.split()
+    try:
+        return [float(element) for element in elements]  # usually all are numbers
+    except ValueError:
+        return [float(e) if _number.fullmatch(e) else e for e in elements]
+
+
+class LabeledSchema:
+    """Rows of the form "label = values", the values are converted to float if possible.
+
+    :param multiple: Store a list of value lists per label, if a label may occur several times
+        (e.g. several phase matching conditions in QMix).
+    """
+
+    def __init__(self, multiple: bool = False) -> None:
+        self.multiple = multiple
+
+    def parse(self, rows: list[str]) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for row in rows:
+            # skip empty lines
+            if not row:
+                continue
+            if row == PHASE_MATCH_ERROR:
+                raise PhaseMatchError
+            label, separator, values = row.partition("=")
+            if not separator:
+                raise ValueError(f"Cannot interpret the result row '{row}'.")
+            label = label.strip()
+            content = _convert(values)
+            if self.multiple:
+                data.setdefault(label, []).append(content)
+            else:
+                data[label] = content
+        return data
+
+
+class Row:
+    """A row "label = values" of a positional schema.
+
+    The label in SNLO is not compared, only the number of values.
+
+    :param key: Key of the row in the result.
+    :param count: Number of values, a single value is stored as scalar.
+    """
+
+    __slots__ = ("key", "count")
+
+    def __init__(self, key: str, count: int = 3) -> None:
+        self.key = key
+        self.count = count
+
+
+class PositionalSchema:
+    """A fixed sequence of rows with numeric values."""
+
+    def __init__(self, rows: list[Row]) -> None:
+        self.rows = rows
+        self._dtype: Optional[Any] = None
+
+    def parse(self, rows: list[str]) -> dict[str, Any]:
+        """Parse the rows.
+
+        :raises ValueError: If the rows do not match the schema, for example if the text is
+            truncated or belongs to another window.
+        """
+        if rows and rows[0] == PHASE_MATCH_ERROR:
+            raise PhaseMatchError
+        texts = [text for text in rows if text.strip()]
+        if len(texts) != len(self.rows):
+            raise ValueError(f"Expected {len(self.rows)} result rows, got {len(texts)}: {rows}.")
+        data: dict[str, Any] = {}
+        for row, text in zip(self.rows, texts):
+            _, separator, values = text.partition("=")
+            if not separator:
+                raise ValueError(f"Cannot interpret the result row '{text}'.")
+            try:
+                numbers = [float(i) for i in values.split()[: row.count]]
+            except ValueError:
+                numbers = []
+            if len(numbers) != row.count:
+                raise ValueError(f"Expected {row.count} numbers in the result row '{text}'.")
+            data[row.key] = numbers[0] if row.count == 1 else numbers
+        return data
+
+    @property
+    def dtype(self):
+        """Numpy dtype of a result record."""
+        if self._dtype is None:
+            import numpy as np
+
+            self._dtype = np.dtype(
+                [(row.key, np.float64, (row.count,) if row.count > 1 else ()) for row in self.rows]
+            )
+        return self._dtype
+
+    def to_records(self, results: Iterable[dict[str, Any]]):
+        """Store parsed results as a numpy structured array with one row per result."""
+        import numpy as np
+
+        results = list(results)
+        records = np.empty(len(results), dtype=self.dtype)
+        for row in self.rows:
+            records[row.key] = [result[row.key] for result in results]
+        return records
+
+    def parse_records(self, texts: Iterable[list[str]]):
+        """Parse the rows of several results directly into a numpy structured array."""
+        return self.to_records(self.parse(rows) for rows in texts)
@@ -0,0 +1,281 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Result store
+============
+
+A local SQLite database of results together with their configuration, one table per function and
+one column per configuration field and result value::
+
+    store = ResultStore("campaign.sqlite")
+    mix = MainWindow().open_two_d_mix_lp()
+    for point, result in store.record(mix, mix.sweep(parameters), campaign="june"):
+        pass
+
+    # all 2D-mix-LP runs with a pump energy between 1 and 5 mJ
+    columns = store.query(
+        "2D-mix-LP",
+        where={("Energy/power (J or W)", 2): (1e-3, 5e-3)},
+        columns=[output_column("Output pulse energy (mJ)", 2)],
+    )
+
+Configuration columns are named "in:<key>[<column>]", result columns "out:<key>[<index>]".
+The swept fields of `record` are indexed. A configuration is stored once per campaign, such that
+the points of a resumed sweep (yielded again from its journal) are not duplicated.
+`query` returns numpy arrays per column. SQLite reads the database pages via memory mapping, the
+rows are still fetched one by one.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Any, Iterable, Iterator, Optional, TYPE_CHECKING, Union
+
+from .base_function import iterate_fields
+from .result_cache import configuration_key
+
+if TYPE_CHECKING:
+    from .base_function import BaseFunction
+
+Field = tuple[str, int]
+
+
+def input_column(key: str, column: int = 0) -> str:
+    """Name of the column of a configuration field."""
+    return f"in:{key}[{column}]"
+
+
+def output_column(key: str, *indices: int) -> str:
+    """Name of the column of a result value, e.g. `output_column("Output pulse energy (mJ)", 2)`."""
+    return f"out:{key}" + "".join(f"[{i}]" for i in indices)
+
+
+def flatten_result(result: dict[str, Any]) -> dict[str, Any]:
+    """Return the values of a result by output column name."""
+    columns: dict[str, Any] = {}
+
+    def add(name: str, value: Any) -> None:
+        if isinstance(value, (list, tuple)):
+            for i, element in enumerate(value):
+                add(f"{name}[{i}]", element)
+        else:
+            columns[name] = value
+
+    for key, value in result.items():
+        add(f"out:{key}", value)
+    return columns
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class ResultStore:
+    """Store of results and their configurations in an SQLite database.
+
+    :param file_name: SQLite database file.
+    :param mmap_size: Maximum number of bytes of the database file, which SQLite reads via memory
+        mapping instead of read calls.
+    """
+
+    def __init__(self, file_name: str, mmap_size: int = 2**30) -> None:
+        if file_name != ":memory:":
+            os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(file_name)
+        self.connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._columns: dict[str, set[str]] = {}
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def tables(self) -> list[str]:
+        """Names of the functions with stored results."""
+        rows = self.connection.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        return [name for (name,) in rows]
+
+    def columns(self, function: str) -> list[str]:
+        """Names of the columns of a function's table."""
+        rows = self.connection.execute(f"PRAGMA table_info({_quote(function)})")
+        return [row[1] for row in rows]
+
+    def _ensure_columns(self, function: str, names: Iterable[str]) -> None:
+        known = self._columns.get(function)
+        if known is None:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(function)} "
+                "(id INTEGER PRIMARY KEY, time REAL, campaign TEXT, configuration TEXT)"
+            )
+            known = self._columns[function] = set(self.columns(function))
+            if "configuration" not in known:  # table of an earlier version
+                self.connection.execute(
+                    f"ALTER TABLE {_quote(function)} ADD COLUMN configuration TEXT"
+                )
+                known.add("configuration")
+            self.connection.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(f'{function}:configuration')} "
+                f"ON {_quote(function)} (coalesce(campaign, ''), configuration)"
+            )
+        for name in names:
+            if name not in known:
+                self.connection.execute(f"ALTER TABLE {_quote(function)} ADD COLUMN {_quote(name)}")
+                known.add(name)
+
+    def add(
+        self,
+        function: str,
+        configuration: dict[Any, Any],
+        result: dict[str, Any],
+        campaign: Optional[str] = None,
+    ) -> None:
+        """Store a result and its configuration, if the configuration is new in the campaign.
+
+        :param configuration: Values by (key, column) fields or configuration data as used in
+            `configure`.
+        """
+        self.extend(function, [(configuration, result)], campaign=campaign)
+
+    def extend(
+        self,
+        function: str,
+        runs: Iterable[tuple[dict[Any, Any], dict[str, Any]]],
+        campaign: Optional[str] = None,
+    ) -> None:
+        """Store several (configuration, result) pairs in a single transaction."""
+        with self.connection:
+            for configuration, result in runs:
+                fields = dict(_configuration_items(configuration))
+                row: dict[str, Any] = {
+                    "time": time.time(),
+                    "campaign": campaign,
+                    "configuration": configuration_key(function, fields),
+                }
+                for field, value in fields.items():
+                    row[input_column(*field)] = _to_number(value)
+                row.update(flatten_result(result))
+                self._ensure_columns(function, row)
+                names = ", ".join(_quote(name) for name in row)
+                self.connection.execute(
+                    f"INSERT OR IGNORE INTO {_quote(function)} ({names}) VALUES "
+                    f"({', '.join('?' * len(row))})",
+                    list(row.values()),
+                )
+
+    def create_index(self, function: str, fields: Iterable[Union[str, Field]]) -> None:
+        """Index columns (names or configuration fields) for fast queries."""
+        with self.connection:
+            for field in fields:
+                name = field if isinstance(field, str) else input_column(*field)
+                self._ensure_columns(function, [name])
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(f'{function}:{name}')} "
+                    f"ON {_quote(function)} ({_quote(name)})"
+                )
+
+    def record(
+        self,
+        function: "BaseFunction",
+        runs: Iterable[tuple[dict[Field, Any], Optional[dict[str, Any]]]],
+        campaign: Optional[str] = None,
+    ) -> Iterator[tuple[dict[Field, Any], Optional[dict[str, Any]]]]:
+        """Store the (point, result) pairs of a sweep while passing them on.
+
+        The complete configuration is taken from the shadow state of `function` and the swept
+        fields are indexed. Failed points (result None) and points already stored in the campaign
+        (e.g. resumed from a journal) are not stored.
+        """
+        from .result_cache import effective_configuration
+        from .sweep import point_to_data
+
+        name = function._function.value
+        indexed: set[Field] = set()
+        for point, result in runs:
+            if result is not None:
+                configuration = effective_configuration(function, point_to_data(point))
+                self.add(name, configuration, result, campaign=campaign)
+                if not indexed.issuperset(point):
+                    self.create_index(name, point)
+                    indexed.update(point)
+            yield point, result
+
+    def query(
+        self,
+        function: str,
+        where: Optional[dict[Union[str, Field], Any]] = None,
+        columns: Optional[list[Union[str, Field]]] = None,
+        campaign: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Return the matching runs of a function as numpy array per column.
+
+        :param where: Conditions per column (name or configuration field): a (low, high) tuple
+            for a range (inclusive) or a single value.
+        :param columns: Columns to return, by default all.
+        """
+        import numpy as np
+
+        conditions: list[str] = []
+        parameters: list[Any] = []
+        for field, condition in (where or {}).items():
+            name = _quote(field if isinstance(field, str) else input_column(*field))
+            if isinstance(condition, tuple):
+                conditions.append(f"{name} BETWEEN ? AND ?")
+                parameters.extend(condition)
+            else:
+                conditions.append(f"{name} = ?")
+                parameters.append(condition)
+        if campaign is not None:
+            conditions.append("campaign = ?")
+            parameters.append(campaign)
+        if columns is None:
+            names = self.columns(function)
+        else:
+            names = [c if isinstance(c, str) else input_column(*c) for c in columns]
+        sql = f"SELECT {', '.join(_quote(n) for n in names)} FROM {_quote(function)}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        rows = self.connection.execute(sql, parameters).fetchall()
+        data: dict[str, Any] = {}
+        for name, values in zip(names, zip(*rows) if rows else [()] * len(names)):
+            try:
+                data[name] = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                data[name] = np.array(values, dtype=object)
+        return data
+
+
+def _to_number(value: Any) -> Any:
+    """Store numbers given as text (as in the shadow state) as numbers."""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value.item() if hasattr(value, "item") else value
+
+
+def _configuration_items(configuration: dict[Any, Any]) -> Iterator[tuple[Field, Any]]:
+    """Iterate over fields and values of a configuration given by fields or as data."""
+    if all(isinstance(field, tuple) for field in configuration):
+        yield from configuration.items()
+    else:
+        for key, column, value in iterate_fields(configuration):
+            yield (key, column), value
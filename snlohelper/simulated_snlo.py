@@ -0,0 +1,507 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Simulated SNLO
+==============
+
+An in-memory stand-in for SNLO, which implements the `utils.GuiBackend` protocol.
+It knows the window layouts of the supported functions (the `_configuration_pos` etc. of the
+function classes and the function menu) and keeps the text of every field, such that the
+function classes work without a desktop. The tab key visits the fields in reading order of their
+positions, such that a wrong `_tab_order` of a function class shows up as misplaced values::
+
+    from snlohelper import utils
+    from snlohelper.simulated_snlo import SimulatedSNLO
+
+    sim = SimulatedSNLO()
+    utils.set_backend(sim)
+    ...
+    print(sim.counts)  # number of GUI operations
+
+The results are produced by toy models, they are not physically meaningful.
+"""
+
+from collections import Counter
+import math
+import time
+from typing import Callable, Optional, Union
+
+from .functions import Functions, _functions_coord
+from .utils import Point, get_screenfactors, get_window_offset
+
+# A model gets the field contents of a window and returns the text of the result field.
+Model = Callable[[dict[str, list[str]]], str]
+# A field model updates output fields of a window after something has been written.
+FieldModel = Callable[[dict[str, list[str]]], None]
+Field = tuple[str, int]
+
+
+def _number(text: str, default: float = 0) -> float:
+    """Return the first number in the text of a field."""
+    try:
+        return float(text.split()[0])
+    except (IndexError, ValueError):
+        return default
+
+
+def _numbers(values: list[str], default: float = 0) -> list[float]:
+    return [_number(v, default) for v in values]
+
+
+def _format(label: str, values: list[float]) -> str:
+    return f"{label} = " + " ".join(f"{v:.4E}" for v in values)
+
+
+def ref_index_model(fields: dict[str, list[str]]) -> str:
+    wavelength_um = _number(fields["Wavelength"][0], 1000) / 1000 or 1
+    n_o = 1.65 + 0.01 / wavelength_um**2
+    n_e = 1.55 + 0.008 / wavelength_um**2
+    return "\r\n".join(
+        (
+            f"Refractive index (o,e) = {n_o:.4f} {n_e:.4f}",
+            f"Group velocity index (o,e) = {n_o + 0.02:.4f} {n_e + 0.02:.4f}",
+            f"GVD (fs^2/mm) (o,e) = {50 / wavelength_um:.1f} {40 / wavelength_um:.1f}",
+            f"theta (deg) = {_number(fields['theta'][0]):.1f}",
+            "",
+        )
+    )
+
+
+def q_mix_model(fields: dict[str, list[str]]) -> str:
+    red1, red2 = _numbers(fields["Red1"], 1178), _numbers(fields["Red2"], 532)
+    blue = 1 / (1 / (red1[0] or 1178) + 1 / (red2[0] or 532))
+    return "\r\n".join(
+        (
+            f"{red1[0]:.1f}(o)+  {red2[0]:.1f}(o)=  {blue:.1f}(e)",
+            "Walkoff [mrad]   =     0.00   0.00  69.90",
+            "Phase velocities = c/  1.652  1.674  1.667",
+            "Group velocities = c/  1.672  1.722  1.769",
+            "GrpDelDisp(fs^2/mm) =   32.7  136.0  229.4",
+            "At theta             =   29.8    deg.",
+            "Deff                 =  2.03E0   pm/V",
+            "",
+        )
+    )
+
+
+def _conversion(energies: list[float], diameters: list[float]) -> tuple[float, float]:
+    """Toy conversion efficiency of the first two beams and their overlap."""
+    d0, d1 = (d if d > 0 else 1 for d in diameters[:2])
+    fluence = math.sqrt(max(energies[0] * energies[1], 0)) / (d0 * d1) * 1e3
+    overlap = 2 * d0 * d1 / (d0**2 + d1**2)
+    return math.tanh(fluence) ** 2, overlap
+
+
+def two_d_mix_lp_model(fields: dict[str, list[str]]) -> str:
+    energies = _numbers(fields["Energy/power (J or W)"])
+    durations = [d or 1 for d in _numbers(fields["Pulse duration (fwhm ns)"], 1)]
+    diameters = _numbers(fields["Beam diam. (fwhm mm)"], 1)
+    efficiency, overlap = _conversion(energies, diameters)
+    area = [math.pi * (d or 1) ** 2 / 4 / 100 for d in diameters]  # sq cm
+    fluence_in = [e / a for e, a in zip(energies, area)]
+    irradiance = [f / t * 1e9 for f, t in zip(fluence_in, durations)]
+    out = [
+        energies[0] * (1 - efficiency * overlap / 2),
+        energies[1] * (1 - efficiency * overlap / 2),
+        energies[2] + (energies[0] + energies[1]) * efficiency * overlap / 2,
+    ]
+    return "\r\n".join(
+        (
+            _format("Peak irradiance (W/sq cm)", irradiance),
+            _format("Input peak fluence (J/sq cm)", fluence_in),
+            _format("Input peak powers (W)", [e / t * 1e9 for e, t in zip(energies, durations)]),
+            _format("Output peak fluence (J/sq cm)", [o / a for o, a in zip(out, area)]),
+            _format("Output pulse energy (mJ)", [o * 1e3 for o in out]),
+            _format("So (W/sq cm)", [2.35e7]),
+            "",
+        )
+    )
+
+
+def two_d_mix_sp_model(fields: dict[str, list[str]]) -> str:
+    energies = _numbers(fields["Pulse energy (Joules)"])
+    efficiency, overlap = _conversion(energies, _numbers(fields["Beam diameter (mm)"], 1))
+    converted = (energies[0] + energies[1]) * efficiency * overlap / 2
+    return "\r\n".join(
+        (
+            _format("Input pulse energy (J)", energies),
+            _format("Output pulse energy (J)", [energies[0], energies[1], energies[2] + converted]),
+            _format("Efficiency", [efficiency * overlap]),
+            _format("So (W/sq cm)", [2.35e7]),
+            "",
+        )
+    )
+
+
+def pw_opo_bb_model(fields: dict[str, list[str]]) -> str:
+    energies = _numbers(fields["Enrgy/Pwr left (J/W)"])
+    efficiency = math.tanh(energies[2] * 1e3) ** 2 if len(energies) > 2 else 0
+    return "\r\n".join(
+        (
+            _format("Input energy/power (J/W)", energies),
+            _format("Output left (J/W)", [energies[2] * efficiency / 2] * 2 + [0]),
+            _format("Output right (J/W)", [0, 0, energies[2] * (1 - efficiency)]),
+            _format("Efficiency", [efficiency]),
+            "",
+        )
+    )
+
+
+def two_d_cav_lp_model(fields: dict[str, list[str]]) -> str:
+    left = _numbers(fields["Enrgy/Pwr left (J/W)"])
+    right = _numbers(fields["Enrgy/Pwr right (J/W)"])
+    efficiency, overlap = _conversion(left, _numbers(fields["Beam diameter (FWHM mm)"], 1))
+    generated = left[2] * efficiency * overlap
+    return "\r\n".join(
+        (
+            _format("Right input (W W -)", right),
+            _format("Left input (W W J)", left),
+            _format("Left output energy (J)", [generated / 2, generated / 2, left[2] - generated]),
+            _format("Right output energy (J)", [0, 0, 0]),
+            _format("So (W/sq cm)", [2.35e7]),
+            "",
+        )
+    )
+
+
+def focus_model(fields: dict[str, list[str]]) -> None:
+    """Calculate the outputs of the Focus window for a gaussian beam."""
+    from .focus import gaussian_focus
+
+    inputs = (
+        _number(fields[key][0], default)
+        for key, default in (
+            ("Wavelength (nm)", 1000),
+            ("Refractive Index", 1),
+            ("Waist size (mm)", 1),
+            ("Dist. to focus (mm)", 0),
+        )
+    )
+    outputs = gaussian_focus(*inputs)
+    for key, value in zip(
+        (
+            "Rayleigh z in xtal (mm)",
+            "Beam size (mm)",
+            "Radius of curv. (mm)",
+            "Far field ang air (mrad)",
+        ),
+        outputs,
+    ):
+        fields[key][0] = f"{float(value):.5G}"
+
+
+default_field_models: dict[str, FieldModel] = {Functions.FOCUS: focus_model}
+
+default_models: dict[str, Model] = {
+    Functions.REF_INDEX: ref_index_model,
+    Functions.QMIX: q_mix_model,
+    Functions.TWOD_MIX_LP: two_d_mix_lp_model,
+    Functions.TWOD_MIX_SP: two_d_mix_sp_model,
+    Functions.PW_OPO_BB: pw_opo_bb_model,
+    Functions.TWOD_CAV_LP: two_d_cav_lp_model,
+}
+
+
+class SimulatedWindow:
+    """A function window with its fields and buttons (in FHD standard coordinates).
+
+    :param tab_order: Order in which the tab key moves through the fields. By default, the fields
+        are visited in reading order of their positions (row by row, left to right), independent
+        of the `_tab_order` declared by the function class.
+    """
+
+    def __init__(
+        self, function: Functions, function_object, tab_order: Optional[list[Field]] = None
+    ) -> None:
+        self.function = function
+        configuration_pos: dict[str, list[Point]] = function_object._configuration_pos
+        self.fields: dict[str, list[str]] = {
+            key: ["0"] * len(positions) for key, positions in configuration_pos.items()
+        }
+        self.positions: dict[Point, Field] = {}
+        for key, positions in configuration_pos.items():
+            for i, pos in enumerate(positions):
+                self.positions[pos] = key, i
+        if tab_order is None:
+            tab_order = [
+                field for pos, field in sorted(self.positions.items(), key=lambda p: p[0][::-1])
+            ]
+        self.tab_order: list[Field] = tab_order
+        self.buttons: dict[Point, str] = {}
+        for name in ("run", "result", "accept", "change_inputs", "close"):
+            pos = getattr(function_object, f"_{name}_pos", None)
+            if pos is not None:
+                self.buttons[pos] = name
+        self.result = ""
+        self._pending: Optional[tuple[float, str]] = None  # finish time and result
+        self.runs = 0
+
+    def get_text(self, field: Union[Field, str]) -> str:
+        if field == "result":
+            self.update()
+            return self.result
+        key, i = field
+        return self.fields[key][i]
+
+    def set_text(self, field: Union[Field, str], text: str) -> None:
+        if field == "result":
+            return  # read only
+        key, i = field
+        self.fields[key][i] = text
+
+    def start_run(self, model: Optional[Model], compute_time: float) -> None:
+        self.runs += 1
+        result = model(self.fields) if model is not None else ""
+        self._pending = time.perf_counter() + compute_time, result
+        self.update()
+
+    def update(self) -> None:
+        """Show the result, if the computation finished."""
+        if self._pending is not None and time.perf_counter() >= self._pending[0]:
+            self.result = self._pending[1]
+            self._pending = None
+
+
+class SimulatedInstance:
+    """State of one SNLO instance: its function windows and the keyboard focus.
+
+    :param offset: Window offset (screen pixels) of the instance, None uses the current one.
+    :param tab_orders: Tab order of the fields per function, see `SimulatedWindow`.
+    """
+
+    def __init__(
+        self,
+        function_classes,
+        offset: Optional[Point] = None,
+        tab_orders: Optional[dict[Functions, list[Field]]] = None,
+    ) -> None:
+        self._function_classes = function_classes
+        self.offset = offset
+        self.tab_orders = {} if tab_orders is None else tab_orders
+        self.windows: dict[Functions, SimulatedWindow] = {}
+        self.active: Optional[SimulatedWindow] = None
+        self.focus: Optional[Union[Field, str]] = None
+        self.selected = False
+
+    def window(self, function: Union[str, Functions]) -> SimulatedWindow:
+        """Get the window of a function, creating it if necessary."""
+        function = Functions(function)
+        if function not in self.windows:
+            self.windows[function] = SimulatedWindow(
+                function, self._function_classes[function](), self.tab_orders.get(function)
+            )
+        return self.windows[function]
+
+
+class SimulatedSNLO:
+    """In-memory SNLO, usable as a GUI backend.
+
+    :param models: Result models (keyed by function name) replacing the default toy models.
+    :param compute_time: Seconds between clicking 'Run' and the result being shown.
+    :param delays: Seconds each GUI operation (e.g. "click", "write") takes.
+    :param screen_size: Reported screen size.
+    :param offsets: Window offsets of several independent SNLO instances. A click goes to the
+        instance with the largest offset left of and above it, key strokes go to the instance
+        clicked last. By default, there is a single instance at the current window offset.
+    :param tab_orders: Tab order of the fields per function name, replacing the reading order of
+        the field positions.
+    """
+
+    def __init__(
+        self,
+        models: Optional[dict[str, Model]] = None,
+        compute_time: float = 0,
+        delays: Optional[dict[str, float]] = None,
+        screen_size: tuple[int, int] = (1920, 1080),
+        offsets: Optional[list[Point]] = None,
+        tab_orders: Optional[dict[str, list[Field]]] = None,
+    ) -> None:
+        from .main_window import function_classes
+
+        self._function_classes = function_classes
+        self.models: dict[str, Model] = dict(default_models)
+        if models is not None:
+            self.models.update(models)
+        self.field_models: dict[str, FieldModel] = dict(default_field_models)
+        self.compute_time = compute_time
+        self.delays = {} if delays is None else delays
+        self.screen_size = screen_size
+        self.counts: Counter[str] = Counter()
+        orders = {} if tab_orders is None else {Functions(f): o for f, o in tab_orders.items()}
+        self.instances = [
+            SimulatedInstance(function_classes, offset, orders)
+            for offset in ([None] if offsets is None else offsets)
+        ]
+        self.current = self.instances[0]
+        self.clipboard = ""
+        self.mouse: Point = (0, 0)
+        self._menu = {pos: Functions(key) for key, pos in _functions_coord.items()}
+
+    # state of the current instance
+    @property
+    def windows(self) -> dict[Functions, SimulatedWindow]:
+        return self.current.windows
+
+    @property
+    def active(self) -> Optional[SimulatedWindow]:
+        return self.current.active
+
+    @active.setter
+    def active(self, value: Optional[SimulatedWindow]) -> None:
+        self.current.active = value
+
+    @property
+    def focus(self) -> Optional[Union[Field, str]]:
+        return self.current.focus
+
+    @focus.setter
+    def focus(self, value: Optional[Union[Field, str]]) -> None:
+        self.current.focus = value
+
+    @property
+    def selected(self) -> bool:
+        return self.current.selected
+
+    @selected.setter
+    def selected(self, value: bool) -> None:
+        self.current.selected = value
+
+    def _record(self, operation: str) -> None:
+        self.counts[operation] += 1
+        delay = self.delays.get(operation, 0)
+        if delay:
+            time.sleep(delay)
+
+    def _select_instance(self, x: float, y: float) -> None:
+        if len(self.instances) == 1:
+            return
+        candidates = [
+            inst
+            for inst in self.instances
+            if inst.offset is not None and inst.offset[0] <= x and inst.offset[1] <= y
+        ]
+        if candidates:
+            self.current = max(candidates, key=lambda inst: inst.offset)  # type: ignore
+
+    def _standard(self, x: float, y: float) -> Point:
+        factors = get_screenfactors() or (1, 1)
+        offset = self.current.offset
+        if offset is None:
+            offset = get_window_offset()
+        return round((x - offset[0]) * factors[0]), round((y - offset[1]) * factors[1])
+
+    def window(self, function: Union[str, Functions]) -> SimulatedWindow:
+        """Get the window of a function of the current instance, creating it if necessary."""
+        return self.current.window(function)
+
+    # GUI backend methods
+    def click(self, x: float, y: float) -> None:
+        self._record("click")
+        self._click(x, y)
+
+    def _click(self, x: float, y: float) -> None:
+        self.mouse = x, y
+        self._select_instance(x, y)
+        self.selected = False
+        pos = self._standard(x, y)
+        if pos in self._menu:
+            function = self._menu[pos]
+            self.active = self.window(function) if function in self._function_classes else None
+            self.focus = None
+            return
+        window = self.active
+        if window is None:
+            self.focus = None
+        elif pos in window.positions:
+            self.focus = window.positions[pos]
+        elif window.buttons.get(pos) == "result":
+            self.focus = "result"
+        elif window.buttons.get(pos) == "run":
+            window.start_run(self.models.get(window.function), self.compute_time)
+        elif window.buttons.get(pos) == "close":
+            self.active = self.focus = None
+        else:
+            self.focus = None
+
+    def double_click(self, x: Optional[float] = None, y: Optional[float] = None) -> None:
+        self._record("double_click")
+        if x is not None and y is not None:
+            self._click(x, y)
+        self.selected = self.focus is not None
+
+    def press(self, key: str) -> None:
+        self._record("press")
+        self._press(key)
+
+    def _press(self, key: str) -> None:
+        if self.active is None or self.focus is None:
+            return
+        if key == "tab":
+            order = self.active.tab_order
+            index = order.index(self.focus) + 1 if self.focus in order else 0
+            self.focus = order[index % len(order)]
+            self.selected = True
+        elif key in ("delete", "backspace"):
+            text = self.active.get_text(self.focus)
+            self.active.set_text(self.focus, "" if self.selected else text[:-1])
+            self.selected = False
+
+    def hotkey(self, *keys: str) -> None:
+        self._record("hotkey")
+        if keys[0] != "ctrl" or self.active is None or self.focus is None:
+            return
+        if keys[-1] == "home":
+            self.selected = False
+        elif keys[-1] in ("end", "a"):
+            self.selected = True
+        elif keys[-1] == "c" and self.selected:
+            self.clipboard = self.active.get_text(self.focus)
+        elif keys[-1] == "v":
+            self._write(self.clipboard)
+
+    def write(self, text: str) -> None:
+        self._record("write")
+        self._write(text)
+        if self.active is not None and self.active.function in self.field_models:
+            self.field_models[self.active.function](self.active.fields)
+
+    def _write(self, text: str) -> None:
+        for character in text:
+            if character == "\t":
+                self._press("tab")
+            elif character == "\n":
+                continue
+            elif self.active is not None and self.focus is not None:
+                old = "" if self.selected else self.active.get_text(self.focus)
+                self.active.set_text(self.focus, old + character)
+                self.selected = False
+
+    def paste(self) -> str:
+        self._record("paste")
+        return self.clipboard
+
+    def size(self) -> tuple[int, int]:
+        return self.screen_size
+
+    def position(self) -> Point:
+        return self.mouse
@@ -20,19 +20,35 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import importlib
 import logging
+from typing import Any
 
 from . import utils
 
-from .main_window import open_function, Functions  # noqa: F401
-from .ref_index import RefractiveIndex  # noqa: F401
-from .two_d_mix_lp import TwoDMixLP  # noqa: F401
-from .two_d_mix_sp import TwoDMixSP  # noqa: F401
-from .focus import focus  # noqa: F401
-
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
+# Names available from this module, imported on first access.
+_lazy_names = {
+    "open_function": "main_window",
+    "Functions": "functions",
+    "RefractiveIndex": "ref_index",
+    "TwoDMixLP": "two_d_mix_lp",
+    "TwoDMixSP": "two_d_mix_sp",
+    "focus": "focus",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _lazy_names[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module}", __package__), name)
+    globals()[name] = value
+    return value
+
 
 def main() -> None:
     """Initialize the SNLO helper."""
@@ -0,0 +1,153 @@
+# MIT License
+
+# Copyright (c) 2024 Benedikt Burger
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Parameter sweeps
+================
+
+Sweep a function over a grid of field values. The fields are given by key and column::
+
+    mix = MainWindow().open_two_d_mix_lp()
+    parameters = {
+        ("Energy/power (J or W)", 1): np.linspace(1e-4, 15e-3, 20),
+        ("Beam diam. (fwhm mm)", 0): [0.1, 0.2],
+    }
+    for point, result in mix.sweep(parameters, journal="sweep.jsonl"):
+        print(point, result["Output pulse energy (mJ)"][2])
+
+Each finished point is appended to the journal file. If the sweep is interrupted, calling it again
+with the same journal yields the stored results instead of running those points again.
+"""
+
+import itertools
+import json
+import logging
+import os
+from typing import Any, Iterable, Iterator, Optional, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from .base_function import BaseFunction
+
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+Field = tuple[str, int]
+Point = dict[Field, Any]
+
+
+def normalize_parameters(parameters: dict[Union[str, Field], Iterable[Any]]) -> dict[Field, list]:
+    """Return the parameters with (key, column) keys, a key alone refers to the first column."""
+    return {
+        (field, 0) if isinstance(field, str) else (field[0], field[1]): list(values)
+        for field, values in parameters.items()
+    }
+
+
+def grid_points(parameters: dict[Field, list]) -> Iterator[Point]:
+    """Yield all points of the grid, the last parameter changes fastest."""
+    fields = list(parameters)
+    for values in itertools.product(*parameters.values()):
+        yield dict(zip(fields, values))
+
+
+def point_to_data(point: Point) -> dict[str, list[Any]]:
+    """Convert a point to configuration data, leaving the other columns unchanged (None)."""
+    data: dict[str, list[Any]] = {}
+    for (key, column), value in point.items():
+        row = data.setdefault(key, [])
+        row.extend([None] * (column + 1 - len(row)))
+        row[column] = value
+    return data
+
+
+def _to_json(value: Any) -> Any:
+    """Convert numpy scalars to python types."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _encode_point(point: Point) -> list[list[Any]]:
+    return [[key, column, _to_json(value)] for (key, column), value in point.items()]
+
+
+def read_journal(file_name: str) -> dict[int, dict[str, Any]]:
+    """Read the finished points of a journal, keyed by their index in the grid."""
+    entries: dict[int, dict[str, Any]] = {}
+    if not os.path.isfile(file_name):
+        return entries
+    with open(file_name, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                log.warning(f"Skipping incomplete line in journal '{file_name}'.")
+                continue
+            entries[entry["index"]] = entry
+    return entries
+
+
+def sweep(
+    function: "BaseFunction",
+    parameters: dict[Union[str, Field], Iterable[Any]],
+    journal: Optional[str] = None,
+    ignore_errors: bool = False,
+    retry_errors: bool = True,
+    **kwargs,
+) -> Iterator[tuple[Point, Optional[dict[str, Any]]]]:
+    """Run `function` for every point of the grid and yield the point and its result.
+
+    :param parameters: Values per field, the field is a key or a (key, column) tuple.
+    :param journal: File to which each result is appended and from which a sweep resumes.
+    :param ignore_errors: Store the error message in the journal and yield None as result instead
+        of raising the exception.
+    :param retry_errors: Run the points again, which failed in a previous run of the journal.
+        Otherwise their stored result (None) is yielded.
+    :param kwargs: Passed to `configure_run_read`. Only changed fields are written, unless
+        `force=True` is given.
+    """
+    grid = normalize_parameters(parameters)
+    finished = {} if journal is None else read_journal(journal)
+    for index, point in enumerate(grid_points(grid)):
+        entry = finished.get(index)
+        if entry is not None:
+            if entry["point"] != _encode_point(point):
+                raise ValueError(f"The journal '{journal}' belongs to a different sweep.")
+            if not (retry_errors and "error" in entry):
+                yield point, entry["result"]
+                continue
+        entry = {"index": index, "point": _encode_point(point)}
+        try:
+            result = function.configure_run_read(
+                point_to_data(point), **{"force": False, **kwargs}
+            )
+        except Exception as exc:
+            if not ignore_errors:
+                raise
+            log.warning(f"Point {point} failed: {exc}")
+            result = None
+            entry["error"] = str(exc)
+        entry["result"] = result
+        if journal is not None:
+            with open(journal, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        yield point, result
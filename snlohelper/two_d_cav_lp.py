@@ -20,8 +20,9 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .main_window import Functions
+from .functions import Functions
 from .mix_methods import MixMethods
+from .result_schema import PositionalSchema, Row
 
 
 class TwoDCavLP(MixMethods):
@@ -33,6 +34,7 @@ class TwoDCavLP(MixMethods):
     _result_pos = (148, 357)
     _change_inputs_pos = (157, 310)
     _close_pos = (480, 135)
+    _run_timeout = 600
     _configuration_pos = {"Wavelengths (nm)": [(330, 151), (397, 151), (464, 151)],
                           "Indexes of refraction": [(330, 167), (397, 167), (464, 167)],
                           "Crystal left reflectivity": [(330, 183), (397, 183), (464, 183)],
@@ -59,12 +61,12 @@ class TwoDCavLP(MixMethods):
                           "Cavity type/inversion": [(330, 527), (397, 527)],
                           "Deff (pm/V)/delta k (1/mm)": [(330, 543), (397, 543)]}
 
-    def interpret_results(self, rows: list[str]) -> dict[str, float | list[float]]:
-        """Interpret the results."""
-        return {
-            "Right input (W W -)": [float(i) for i in rows[0].split()[6:]],
-            "Left input (W W J)": [float(i) for i in rows[1].split()[6:]],
-            "Left output energy (J)": [float(i) for i in rows[2].split()[5:]],
-            "Right output energy (J)": [float(i) for i in rows[3].split()[5:]],
-            "So (W/sq cm)": float(rows[4].split()[4]),
-        }
+    _result_schema = PositionalSchema(
+        [
+            Row("Right input (W W -)", count=2),
+            Row("Left input (W W J)"),
+            Row("Left output energy (J)"),
+            Row("Right output energy (J)"),
+            Row("So (W/sq cm)", count=1),
+        ]
+    )
@@ -20,8 +20,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .main_window import Functions
+from .base_function import generate_tab_order
+from .functions import Functions
 from .mix_methods import MixMethods
+from .result_schema import PositionalSchema, Row
 
 
 class TwoDMixLP(MixMethods):
@@ -33,6 +35,7 @@ class TwoDMixLP(MixMethods):
     _close_pos = (540, 140)
     _change_inputs_pos = (373, 166)
     _result_pos = (133, 293)
+    _run_timeout = 60
 
     # coordinates of the 2DmixLP-function (in FHD standard)
     _configuration_pos = {
@@ -62,14 +65,15 @@ class TwoDMixLP(MixMethods):
         "Dist. to image (mm)": [(400, 546)],
         "# time steps": [(400, 566)],
     }
-
-    def interpret_results(self, rows: list[str]) -> dict[str, float | list[float]]:
-        """Interpret the results."""
-        return {
-            "Input peak irradiance (W/sq cm)": [float(i) for i in rows[0].split()[5:]],
-            "Input peak fluence (J/sq cm)": [float(i) for i in rows[1].split()[6:]],
-            "Input peak powers (W)": [float(i) for i in rows[2].split()[5:]],
-            "Output peak fluence (J/sq cm)": [float(i) for i in rows[3].split()[6:]],
-            "Output pulse energy (mJ)": [float(i) for i in rows[4].split()[5:]],
-            "So (W/sq cm)": float(rows[5].split()[4]),
-        }
+    # the tab key moves through the fields row by row (not yet verified against SNLO)
+    _tab_order = generate_tab_order(_configuration_pos)
+    _result_schema = PositionalSchema(
+        [
+            Row("Input peak irradiance (W/sq cm)"),
+            Row("Input peak fluence (J/sq cm)"),
+            Row("Input peak powers (W)"),
+            Row("Output peak fluence (J/sq cm)"),
+            Row("Output pulse energy (mJ)"),
+            Row("So (W/sq cm)", count=1),
+        ]
+    )
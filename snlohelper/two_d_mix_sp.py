@@ -20,7 +20,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .main_window import Functions
+from .functions import Functions
 from .mix_methods import MixMethods
 
 
@@ -33,6 +33,7 @@ class TwoDMixSP(MixMethods):
     _close_pos = (540, 140)
     _change_inputs_pos = (150, 266)
     _result_pos = (133, 293)
+    _run_timeout = 600
 
     # coordinates of the 2DmixLP-function (in FHD standard)
     _configuration_pos = {
@@ -27,17 +27,174 @@ Autoclicker setup
 General methods for the autoclicker
 """
 
+import json
 import logging
-from typing import Any, Optional, Union
-
-import pyautogui as gui
-from pyperclip import paste
+import os
+import time
+from typing import Any, Iterable, Optional, Protocol, Union
 
+from .instrumentation import timed
 
 log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 
-Point = Union[gui.Point, tuple[float, float]]
+Point = tuple[float, float]
+
+
+"""
+GUI backend
+-----------
+
+All mouse, keyboard and clipboard access goes through a backend. The default backend uses
+pyautogui and pyperclip, which are imported only when the backend is created.
+Use `set_backend` to replace it, for example with a `simulated_snlo.SimulatedSNLO` instance for
+headless runs.
+"""
+
+
+class GuiBackend(Protocol):
+    """The primitives needed to control SNLO. Coordinates are in screen pixels."""
+
+    def click(self, x: float, y: float) -> None: ...
+
+    def double_click(self, x: Optional[float] = None, y: Optional[float] = None) -> None:
+        """Double click at the position or at the current mouse position."""
+        ...
+
+    def press(self, key: str) -> None: ...
+
+    def hotkey(self, *keys: str) -> None: ...
+
+    def write(self, text: str) -> None: ...
+
+    def paste(self) -> str:
+        """Return the clipboard content."""
+        ...
+
+    def size(self) -> tuple[int, int]:
+        """Return the screen size."""
+        ...
+
+    def position(self) -> Point:
+        """Return the mouse position."""
+        ...
+
+
+# Actions with an individual delay afterwards (for "paste" before reading the clipboard).
+ACTIONS = ("click", "double_click", "press", "hotkey", "write", "paste")
+# Conservative delays in seconds, equal to pyautogui's default pause. Reading the clipboard did not
+# pause at all.
+CONSERVATIVE_DELAYS: dict[str, float] = {action: 0.1 for action in ACTIONS}
+CONSERVATIVE_DELAYS["paste"] = 0
+LATENCY_PROFILE_FILE = os.path.join(os.path.expanduser("~"), ".snlohelper", "latency.json")
+
+
+def load_latency_profile(file_name: str = LATENCY_PROFILE_FILE) -> dict[str, float]:
+    """Load the delays per action from a latency profile or return the conservative values."""
+    delays = dict(CONSERVATIVE_DELAYS)
+    try:
+        with open(file_name, "r") as f:
+            profile = json.load(f)
+        delays.update({action: float(profile[action]) for action in ACTIONS if action in profile})
+    except FileNotFoundError:
+        pass
+    except (ValueError, TypeError, AttributeError) as exc:
+        log.warning(f"Invalid latency profile '{file_name}', using conservative delays: {exc}")
+        return dict(CONSERVATIVE_DELAYS)
+    return delays
+
+
+def save_latency_profile(delays: dict[str, float], file_name: str = LATENCY_PROFILE_FILE) -> None:
+    """Save the delays per action as a latency profile."""
+    os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+    with open(file_name, "w") as f:
+        json.dump(delays, f, indent=2)
+
+
+class PyAutoGuiBackend:
+    """Backend controlling the real desktop via pyautogui and pyperclip.
+
+    Instead of pyautogui's global `PAUSE`, it waits an individual delay after each action.
+
+    :param delays: Seconds to wait per action, by default the stored latency profile.
+    """
+
+    def __init__(self, delays: Optional[dict[str, float]] = None) -> None:
+        import pyautogui
+        import pyperclip
+
+        self.gui = pyautogui
+        self._paste = pyperclip.paste
+        self.delays = load_latency_profile() if delays is None else delays
+
+    def _wait(self, action: str) -> None:
+        time.sleep(self.delays.get(action, CONSERVATIVE_DELAYS[action]))
+
+    def click(self, x: float, y: float) -> None:
+        self.gui.click(x, y, _pause=False)
+        self._wait("click")
+
+    def double_click(self, x: Optional[float] = None, y: Optional[float] = None) -> None:
+        self.gui.doubleClick(x, y, _pause=False)
+        self._wait("double_click")
+
+    def press(self, key: str) -> None:
+        self.gui.press(key, _pause=False)
+        self._wait("press")
+
+    def hotkey(self, *keys: str) -> None:
+        self.gui.hotkey(*keys, _pause=False)
+        self._wait("hotkey")
+
+    def write(self, text: str) -> None:
+        self.gui.write(text, _pause=False)
+        self._wait("write")
+
+    def paste(self) -> str:
+        self._wait("paste")
+        return self._paste()
+
+    def size(self) -> tuple[int, int]:
+        return tuple(self.gui.size())  # type: ignore
+
+    def position(self) -> Point:
+        return tuple(self.gui.position())  # type: ignore
+
+
+def get_backend() -> GuiBackend:
+    """Get the current GUI backend, creating the pyautogui backend if none is set."""
+    global backend
+    try:
+        return backend
+    except NameError:
+        backend = PyAutoGuiBackend()
+        return backend
+
+
+def set_backend(new_backend: Optional[GuiBackend] = None) -> Optional[GuiBackend]:
+    """Set the GUI backend (None resets to pyautogui on next use) and return the previous one."""
+    global backend
+    try:
+        old = backend
+    except NameError:
+        old = None
+    if new_backend is None:
+        try:
+            del backend
+        except NameError:
+            pass
+    else:
+        backend = new_backend
+    return old
+
+
+def __getattr__(name: str) -> Any:
+    # `gui` used to be imported at module level, keep it available for existing scripts.
+    if name == "gui":
+        import pyautogui
+
+        return pyautogui
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 """
@@ -46,13 +203,21 @@ Setup of the screen and scaling
 -------------------------------
 
 All positions in code are given on a Full HD (1920 * 1080) screen and dynamically adjusted to the
-screen resolution.
+screen resolution. If the SNLO window is not at the top left corner, set the window offset (in
+screen pixels).
+The screen coordinates of each position are computed once and stored in a layout table, see
+`to_screen`. Every window offset keeps its own table, such that switching between several SNLO
+windows does not recompute the coordinates.
 """
 
+window_offset: Point = (0, 0)
+_layout_tables: dict[Point, dict[Point, Point]] = {window_offset: {}}
+_screen_positions: dict[Point, Point] = _layout_tables[window_offset]
+
 
 def read_display_screenfactors(standard: Point = (1920, 1080)) -> Point:
     """Read the scaling factor from Full HD to the current display resolution."""
-    width, height = gui.size()
+    width, height = get_backend().size()
     return standard[0] / width, standard[1] / height
 
 
@@ -60,6 +225,8 @@ def set_screenfactors(new_factors: Optional[tuple[float, float]] = None) -> tupl
     """Set the screenfactors to `new_factors` or detect them automatically."""
     global factors
     factors = read_display_screenfactors() if new_factors is None else new_factors
+    for table in _layout_tables.values():
+        table.clear()
     return factors
 
 
@@ -72,6 +239,19 @@ def get_screenfactors() -> Optional[tuple[float, float]]:
         return None
 
 
+def set_window_offset(offset: Point = (0, 0)) -> None:
+    """Set the offset (in screen pixels) of the SNLO window relative to the top left corner."""
+    global window_offset, _screen_positions
+    window_offset = offset[0], offset[1]
+    _screen_positions = _layout_tables.setdefault(window_offset, {})
+
+
+def get_window_offset() -> Point:
+    """Get the offset (in screen pixels) of the SNLO window."""
+    return window_offset
+
+
+@timed("scale")
 def scale(x: Union[float, Point], y: Optional[float] = None) -> Point:
     """Scale coordinates from the definition standard to the current screen."""
     global factors
@@ -83,18 +263,35 @@ def scale(x: Union[float, Point], y: Optional[float] = None) -> Point:
     elif y is None:
         raise ValueError("You have to specify two coordinatres.")
     try:
-        return x / factors[0], y / factors[1]
+        return x / factors[0] + window_offset[0], y / factors[1] + window_offset[1]
     except NameError:
         log.warning("Factors was not set, running `set_screenfactors` to get values.")
         set_screenfactors()
-        return x / factors[0], y / factors[1]
+        return x / factors[0] + window_offset[0], y / factors[1] + window_offset[1]
+
+
+def to_screen(position: Point) -> Point:
+    """Get the screen coordinates of a position (in standard coordinates) from the layout table."""
+    try:
+        return _screen_positions[position]
+    except KeyError:
+        screen_position = _screen_positions[position] = scale(*position)
+        return screen_position
+    except TypeError:  # unhashable, e.g. a list
+        return scale(*position)
+
+
+def compile_layout(positions: Iterable[Point]) -> None:
+    """Compute the screen coordinates of all `positions` in advance."""
+    for position in positions:
+        to_screen(position)
 
 
 def standard_position() -> Point:
     """Get the mouse position in standard coordinates (x, y)."""
-    point = gui.position()
+    x, y = get_backend().position()
     global factors
-    return point.x * factors[0], point.y * factors[1]
+    return (x - window_offset[0]) * factors[0], (y - window_offset[1]) * factors[1]
 
 
 """
@@ -105,14 +302,22 @@ GUI functions to get/set content from/into data fields.
 """
 
 
+@timed("click")
+def click(position: Point) -> None:
+    """Click at the position."""
+    get_backend().click(*to_screen(position))
+
+
+@timed("get_content")
 def get_content(position: Point) -> str:
     """Get the content of the field at position via double click.
 
     If there is a "-" in the text, the extraction fails!
     """
-    gui.doubleClick(*scale(*position))
-    gui.hotkey("ctrl", "c")
-    return paste()
+    b = get_backend()
+    b.double_click(*to_screen(position))
+    b.hotkey("ctrl", "c")
+    return b.paste()
 
 
 def get_value(position: Point) -> float:
@@ -120,14 +325,16 @@ def get_value(position: Point) -> float:
     return float(get_content(position))
 
 
+@timed("get_content_complete")
 def get_content_complete(position: Point) -> str:
     """Go to position and retrieve the content there, marking all."""
-    gui.click(*scale(*position))
-    gui.hotkey("ctrl", "home")
+    b = get_backend()
+    b.click(*to_screen(position))
+    b.hotkey("ctrl", "home")
     # both shift keys are necessary if keylock is on
-    gui.hotkey("ctrl", "shiftleft", "shiftright", "end")
-    gui.hotkey("ctrl", "c")
-    return paste()
+    b.hotkey("ctrl", "shiftleft", "shiftright", "end")
+    b.hotkey("ctrl", "c")
+    return b.paste()
 
 
 def get_value_complete(position: Point) -> float:
@@ -135,17 +342,34 @@ def get_value_complete(position: Point) -> float:
     return float(get_content_complete(position))
 
 
+@timed("set_value")
 def set_value(position: Point, value: Any) -> None:
     """Move to position, insert value as string."""
-    gui.doubleClick(*scale(*position))
-    gui.press("delete")
-    gui.doubleClick()
-    gui.write(str(value))
+    b = get_backend()
+    b.double_click(*to_screen(position))
+    b.press("delete")
+    b.double_click()
+    b.write(str(value))
+
+
+@timed("write_tabbed")
+def write_tabbed(position: Point, values: list[Any]) -> None:
+    """Enter values into the field at position and the following ones in a single keystroke stream.
+
+    The fields after the first one are reached with the tab key. This assumes, that tabbing into a
+    field selects its content (as in Windows edit controls), such that the typed value replaces it.
+    A value of None types nothing and leaves that field unchanged.
+    """
+    b = get_backend()
+    b.click(*to_screen(position))
+    b.hotkey("ctrl", "home")
+    b.hotkey("ctrl", "shiftleft", "shiftright", "end")
+    b.write("\t".join("" if value is None else str(value) for value in values))
 
 
 def alt_tab() -> None:
-    gui.hotkey("alt", "tab")
+    get_backend().hotkey("alt", "tab")
 
 
 def get_position() -> Point:
-    return gui.position()
+    return get_backend().position()
@@ -0,0 +1,66 @@
+"""Sessions of the GUI executor exclude other work."""
+
+import asyncio
+import threading
+
+import pytest
+
+from snlohelper import utils
+from snlohelper.base_function import invalidate_shadows
+from snlohelper.gui_executor import GuiExecutor
+from snlohelper.ref_index import RefractiveIndex
+from snlohelper.simulated_snlo import SimulatedSNLO
+from snlohelper.two_d_mix_lp import TwoDMixLP
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    sim = SimulatedSNLO(compute_time=0.05)
+    old = utils.set_backend(sim)
+    utils.set_screenfactors((1, 1))
+    utils.set_window_offset((0, 0))
+    invalidate_shadows()
+    executor = GuiExecutor()
+    monkeypatch.setattr("snlohelper.gui_executor.gui_executor", executor, raising=False)
+    yield executor
+    executor.shutdown()
+    utils.set_backend(old)
+
+
+def test_session_excludes_submitted_work(executor: GuiExecutor):
+    data = {"Energy/power (J or W)": [1e-3, 2e-3, 0], "Pulse duration (fwhm ns)": [1, 1, 1]}
+    ri = RefractiveIndex()
+
+    def submit_runs() -> None:
+        for _ in range(5):
+            executor.submit(ri.configure_run_read, {"Wavelength": 500}).result()
+
+    thread = threading.Thread(target=submit_runs)
+
+    async def main():
+        thread.start()
+        return await asyncio.gather(
+            *(TwoDMixLP().configure_run_read_async(data, waiting_time=0.05) for _ in range(3))
+        )
+
+    results = asyncio.run(main())
+    thread.join()
+    for result in results:
+        assert result["Input peak powers (W)"] == pytest.approx([1e6, 2e6, 0])
+
+
+def test_session_is_shared_between_loops(executor: GuiExecutor):
+    order = []
+
+    async def hold(name: str) -> None:
+        async with executor.session():
+            order.append(f"{name} start")
+            await asyncio.sleep(0.05)
+            order.append(f"{name} end")
+
+    threads = [threading.Thread(target=asyncio.run, args=(hold(n),)) for n in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert order[0][0] == order[1][0] and order[2][0] == order[3][0]
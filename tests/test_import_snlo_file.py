@@ -0,0 +1,16 @@
+"""Parsing the text of SNLO output files."""
+
+import numpy as np
+
+from snlohelper.import_snlo_file import parse_snlo_text
+
+
+def test_fused_negative_numbers():
+    data = parse_snlo_text(b"9.206897E-100-1.616264E-2\r\n1.0E+0 2.0E+0\r\n")
+    assert data is not None
+    np.testing.assert_allclose(data, [[9.206897e-100, -1.616264e-2], [1, 2]])
+
+
+def test_rows_of_different_widths():
+    # eight numbers, as many as four rows of two numbers
+    assert parse_snlo_text(b"1 2\n3\n4 5 6\n7 8") is None
@@ -0,0 +1,37 @@
+"""Pipelined runs on several simulated SNLO instances."""
+
+import pytest
+
+from snlohelper import utils
+from snlohelper.base_function import invalidate_shadows
+from snlohelper.functions import Functions
+from snlohelper.pipeline import PipelineScheduler
+from snlohelper.simulated_snlo import SimulatedSNLO
+from snlohelper.two_d_mix_lp import TwoDMixLP
+
+offsets = [(0, 0), (960, 0)]
+
+
+@pytest.fixture
+def sim():
+    sim = SimulatedSNLO(offsets=offsets, compute_time=0.2)
+    old = utils.set_backend(sim)
+    utils.set_screenfactors((1, 1))
+    utils.set_window_offset((0, 0))
+    invalidate_shadows()
+    yield sim
+    utils.set_backend(old)
+
+
+def test_results_of_long_runs_in_order(sim: SimulatedSNLO):
+    scheduler = PipelineScheduler(TwoDMixLP, offsets, waiting_time=0.05, interval=0.05)
+    configurations = [{"Energy/power (J or W)": [None, e * 1e-3, None]} for e in range(1, 7)]
+    powers = [result["Input peak powers (W)"][1] for result in scheduler.map(configurations)]
+    assert powers == pytest.approx([1e6, 2e6, 3e6, 4e6, 5e6, 6e6])
+
+
+def test_timeout(sim: SimulatedSNLO):
+    sim.models[Functions.TWOD_MIX_LP] = lambda fields: ""
+    scheduler = PipelineScheduler(TwoDMixLP, offsets, interval=0.05, timeout=0.3)
+    with pytest.raises(TimeoutError):
+        list(scheduler.map([{"Energy/power (J or W)": [None, 1e-3, None]}]))
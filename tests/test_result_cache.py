@@ -0,0 +1,26 @@
+"""Eviction and the in-memory part of the result cache."""
+
+import time
+
+from snlohelper.result_cache import ResultCache
+
+
+def test_memory_hit_counts_as_access():
+    cache = ResultCache(":memory:", max_size=20)
+    cache.put("a", {"v": 1})
+    time.sleep(0.01)
+    cache.put("b", {"v": 2})
+    time.sleep(0.01)
+    assert cache.get("a") == {"v": 1}
+    time.sleep(0.01)
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+
+
+def test_memory_size():
+    cache = ResultCache(":memory:", memory_size=2)
+    for key in "abc":
+        cache.put(key, {"v": key})
+    assert list(cache._memory) == ["b", "c"]
+    assert cache.get("a") == {"v": "a"}  # from the database
@@ -0,0 +1,47 @@
+"""Parsing results with the result schemas."""
+
+import pytest
+
+from snlohelper.result_schema import PhaseMatchError
+from snlohelper.simulated_snlo import ref_index_model, two_d_mix_lp_model
+from snlohelper.two_d_mix_lp import TwoDMixLP
+
+schema = TwoDMixLP._result_schema
+fields = {
+    "Energy/power (J or W)": ["1E-3", "2E-3", "0"],
+    "Pulse duration (fwhm ns)": ["1", "1", "1"],
+    "Beam diam. (fwhm mm)": ["1", "1", "1"],
+}
+rows = two_d_mix_lp_model(fields).split("\r\n")
+
+
+def test_parse():
+    result = schema.parse(rows)
+    assert result["Input peak powers (W)"] == pytest.approx([1e6, 2e6, 0])
+    assert result["So (W/sq cm)"] == 2.35e7
+
+
+def test_phase_match_error():
+    with pytest.raises(PhaseMatchError):
+        schema.parse(["ERROR: No phase match found."])
+
+
+def test_truncated_rows():
+    with pytest.raises(ValueError):
+        schema.parse(rows[:3])
+
+
+def test_truncated_values():
+    with pytest.raises(ValueError):
+        schema.parse(rows[:4] + [rows[4].rsplit(" ", 1)[0]] + rows[5:])
+
+
+def test_rows_of_another_window():
+    with pytest.raises(ValueError):
+        other = ref_index_model({"Wavelength": ["500"], "theta": ["0"]}).split("\r\n")
+        schema.parse([row for row in other * 2 if row][: len(schema.rows)])
+
+
+def test_labels_are_not_compared():
+    relabeled = ["Input irradiance = " + rows[0].partition("=")[2]] + rows[1:]
+    assert schema.parse(relabeled) == schema.parse(rows)
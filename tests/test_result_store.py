@@ -0,0 +1,43 @@
+"""Storing sweeps in the result store."""
+
+import pytest
+
+from snlohelper import utils
+from snlohelper.base_function import invalidate_shadows
+from snlohelper.ref_index import RefractiveIndex
+from snlohelper.result_store import ResultStore, output_column
+from snlohelper.simulated_snlo import SimulatedSNLO
+
+
+@pytest.fixture
+def ri():
+    old = utils.set_backend(SimulatedSNLO())
+    utils.set_screenfactors((1, 1))
+    utils.set_window_offset((0, 0))
+    invalidate_shadows()
+    yield RefractiveIndex()
+    utils.set_backend(old)
+
+
+def test_resumed_sweep_is_stored_once(ri: RefractiveIndex, tmp_path):
+    store = ResultStore(":memory:")
+    journal = str(tmp_path / "journal.jsonl")
+    parameters = {"Wavelength": [400, 500, 600, 700]}
+    runs = store.record(ri, ri.sweep(parameters, journal=journal), campaign="test")
+    for _ in range(2):  # interrupted sweep
+        next(runs)
+    runs.close()
+    list(store.record(ri, ri.sweep(parameters, journal=journal), campaign="test"))
+    data = store.query("Ref. Ind.", columns=[("Wavelength", 0)], campaign="test")
+    assert sorted(data["in:Wavelength[0]"]) == [400, 500, 600, 700]
+
+
+def test_query_range(ri: RefractiveIndex):
+    store = ResultStore(":memory:")
+    list(store.record(ri, ri.sweep({"Wavelength": [400, 500, 600]})))
+    data = store.query(
+        "Ref. Ind.",
+        where={("Wavelength", 0): (450, 650)},
+        columns=[output_column("Refractive index (o,e)", 0)],
+    )
+    assert len(data[output_column("Refractive index (o,e)", 0)]) == 2
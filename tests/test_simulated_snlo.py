@@ -0,0 +1,145 @@
+"""Configure, run, and read every function class with the simulated SNLO."""
+
+import time
+
+import pytest
+
+from snlohelper import utils
+from snlohelper.base_function import invalidate_shadows
+from snlohelper.focus import focus, gaussian_focus
+from snlohelper.functions import Functions
+from snlohelper.main_window import function_classes
+from snlohelper.simulated_snlo import SimulatedSNLO
+
+
+@pytest.fixture
+def sim():
+    sim = SimulatedSNLO()
+    old = utils.set_backend(sim)
+    utils.set_screenfactors((1, 1))
+    utils.set_window_offset((0, 0))
+    invalidate_shadows()
+    yield sim
+    utils.set_backend(old)
+
+
+# function, configuration, and an expected entry of the result
+cases = [
+    (Functions.REF_INDEX, {"Wavelength": 500}, ("Refractive index (o,e)", [1.69, 1.582])),
+    (Functions.QMIX, {"Red1": 1064, "Red2": 1064}, ("1064.0(o)+  1064.0(o)", [["532.0(e)"]])),
+    (
+        Functions.TWOD_MIX_LP,
+        {"Energy/power (J or W)": [1e-3, 2e-3, 0], "Pulse duration (fwhm ns)": [1, 1, 1]},
+        ("Input peak powers (W)", [1e6, 2e6, 0]),
+    ),
+    (
+        Functions.TWOD_MIX_SP,
+        {"Pulse energy (Joules)": [1, 2, 0]},
+        ("Input pulse energy (J)", [1, 2, 0]),
+    ),
+    (
+        Functions.PW_OPO_BB,
+        {"Enrgy/Pwr left (J/W)": [0, 0, 1e-3]},
+        ("Input energy/power (J/W)", [[0, 0, 1e-3]]),
+    ),
+    (
+        Functions.TWOD_CAV_LP,
+        {"Enrgy/Pwr right (J/W)": [1, 2]},
+        ("Right input (W W -)", [1, 2]),
+    ),
+]
+
+
+@pytest.mark.parametrize("function, configuration, expected", cases)
+def test_configure_run_read(sim: SimulatedSNLO, function, configuration, expected):
+    result = function_classes[function]().configure_run_read(configuration)
+    key, value = expected
+    if isinstance(value[0], list):
+        assert result[key] == value
+    else:
+        assert result[key] == pytest.approx(value)
+    assert sim.window(function).runs == 1
+
+
+@pytest.mark.parametrize("function, configuration, expected", cases)
+def test_configure_writes_fields(sim: SimulatedSNLO, function, configuration, expected):
+    function_classes[function]().configure(configuration)
+    fields = sim.window(function).fields
+    for key, value in configuration.items():
+        values = value if isinstance(value, list) else [value]
+        assert [float(v) for v in fields[key][: len(values)]] == values
+
+
+def test_get_configuration(sim: SimulatedSNLO):
+    ri = function_classes[Functions.REF_INDEX]()
+    ri.configure({"Wavelength": 500, "theta": 30})
+    configuration = ri.get_configuration()
+    assert configuration["Wavelength"] == [500]
+    assert configuration["theta"] == [30]
+
+
+def test_focus(sim: SimulatedSNLO):
+    result = function_classes[Functions.FOCUS]().focus(1064, 1.6, 1, 10)
+    assert result == pytest.approx(gaussian_focus(1064, 1.6, 1, 10), rel=1e-4)
+
+
+def test_wrong_tab_order_misplaces_values(sim: SimulatedSNLO):
+    TwoDMixLP = function_classes[Functions.TWOD_MIX_LP]
+
+    class ColumnWise(TwoDMixLP):
+        _tab_order = sorted(TwoDMixLP._tab_order, key=lambda field: field[1])
+
+    ColumnWise().configure({"Wavelengths (nm)": [1064, 532, 355]}, bulk=True)
+    assert sim.window(Functions.TWOD_MIX_LP).fields["Wavelengths (nm)"] != ["1064", "532", "355"]
+
+
+def test_shadow_shared_between_objects(sim: SimulatedSNLO):
+    RefractiveIndex = function_classes[Functions.REF_INDEX]
+    r1, r2 = RefractiveIndex(), RefractiveIndex()
+    r1.configure({"Wavelength": 500}, force=False)
+    r2.configure({"Wavelength": 1500}, force=False)
+    r1.configure({"Wavelength": 500}, force=False)
+    assert sim.window(Functions.REF_INDEX).fields["Wavelength"] == ["500"]
+
+
+def test_focus_function_updates_shadow(sim: SimulatedSNLO):
+    ff = function_classes[Functions.FOCUS]()
+    ff.configure({"Wavelength (nm)": 1064}, force=False)
+    focus(800, 1.5, 2, 5)
+    ff.configure({"Wavelength (nm)": 1064}, force=False)
+    assert sim.window(Functions.FOCUS).fields["Wavelength (nm)"] == ["1064"]
+
+
+def test_repeated_run_returns_unchanged_result(sim: SimulatedSNLO):
+    ri = function_classes[Functions.REF_INDEX]()
+    ri.configure({"Wavelength": 500})
+    first = ri.run_and_read(waiting_time=0.1, max_tries=10, interval=0.5)
+    start = time.perf_counter()
+    assert ri.run_and_read(waiting_time=0.1, max_tries=10, interval=0.5) == first
+    assert time.perf_counter() - start < 1
+
+
+def test_slow_run_returns_new_result(sim: SimulatedSNLO):
+    sim.compute_time = 0.3
+    mix = function_classes[Functions.TWOD_MIX_LP]()
+    kwargs = {"waiting_time": 0.05, "max_tries": 10, "interval": 0.1}
+    mix.configure_run_read({"Energy/power (J or W)": [1e-3, 1e-3, 0]}, **kwargs)
+    result = mix.configure_run_read({"Energy/power (J or W)": [2e-3, 1e-3, 0]}, **kwargs)
+    assert result["Input peak powers (W)"] == pytest.approx([2e6, 1e6, 0])
+
+
+def test_unchanged_result_of_new_configuration_times_out(sim: SimulatedSNLO):
+    sim.models[Functions.REF_INDEX] = lambda fields: "a = 1\r\nb = 2\r\nc = 3\r\nd = 4"
+    ri = function_classes[Functions.REF_INDEX]()
+    ri.configure_run_read({"Wavelength": 500})
+    with pytest.raises(TimeoutError):
+        ri.configure_run_read({"Wavelength": 800})
+
+
+def test_run_and_read_uses_last_result(sim: SimulatedSNLO):
+    ri = function_classes[Functions.REF_INDEX]()
+    ri.configure_run_read({"Wavelength": 500})
+    pastes = sim.counts["paste"]
+    ri.configure_run_read({"Wavelength": 800})
+    # reading the change and its stability
+    assert sim.counts["paste"] - pastes == 2